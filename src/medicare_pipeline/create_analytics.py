@@ -1,13 +1,9 @@
 import polars as pl
+import pyarrow.parquet as pq
 from pathlib import Path
 import logging
-import glob
 from typing import List, Optional
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 
@@ -40,36 +36,56 @@ class AnalyticsBuilder:
         self.gold_dir = Path(gold_dir)
         self.gold_dir.mkdir(parents=True, exist_ok=True)
 
-    def _get_silver_files(self, table_name: str) -> List[Path]:
-        """Get all files for a specific table in the silver layer."""
-        pattern = f"{self.silver_dir}/{table_name}/**/*.parquet"
-        return [Path(f) for f in glob.glob(pattern, recursive=True)]
-
-    def _get_gold_files(self, table_name: str) -> List[Path]:
-        """Get all files for a specific table in the gold layer."""
-        pattern = f"{self.gold_dir}/{table_name}/**/*.parquet"
-        return [Path(f) for f in glob.glob(pattern, recursive=True)]
-
-    def _read_complete_table(
-        self, table_name: str, from_gold: bool = False
-    ) -> Optional[pl.DataFrame]:
-        """Read and combine all files for a specific table into a single dataframe."""
-        if from_gold:
-            files = self._get_gold_files(table_name)
-        else:
-            files = self._get_silver_files(table_name)
-
-        dfs = []
-        for file in files:
-            logger.info(f"Reading {file}")
-            df = pl.read_parquet(file)
-            dfs.append(df)
-
-        if not dfs:
+    def _scan_table(self, table_name: str, from_gold: bool = False) -> pl.LazyFrame:
+        """
+        Lazily scan all files for a specific table as a single LazyFrame.
+
+        Nothing is read until the query is executed, so downstream selects and
+        filters push down into the scan instead of materializing whole tables.
+        Tables are scanned as hive-partitioned datasets so filters on the
+        partition keys (e.g. year) prune whole directories instead of opening
+        every file.
+        """
+        base_dir = self.gold_dir if from_gold else self.silver_dir
+        table_dir = base_dir / table_name
+
+        if not table_dir.exists():
             logger.error(f"No valid data found for {table_name}")
             raise ValueError(f"No valid data found for {table_name}")
 
-        return pl.concat(dfs)
+        logger.info(f"Scanning {table_dir}")
+        return pl.scan_parquet(table_dir, hive_partitioning=True)
+
+    def _sink_partitioned_by_year(
+        self,
+        lf: pl.LazyFrame,
+        output_path: Path,
+        file_name: str,
+        row_group_size: Optional[int] = None,
+    ) -> List[Path]:
+        """
+        Stream a lazy pipeline into hive-style year=YYYY directories.
+
+        The whole frame is written in a single pass instead of materializing
+        one DataFrame per partition, and the canonical hive names let readers
+        discover and prune partitions natively.
+        """
+        lf.sink_parquet(
+            pl.PartitionBy(
+                output_path,
+                key="year",
+                include_key=True,
+                file_path_provider=lambda args: (
+                    f"year={args.partition_keys.item()}/{file_name}"
+                ),
+                approximate_bytes_per_file=None,
+            ),
+            compression="zstd",
+            statistics=True,
+            row_group_size=row_group_size,
+            mkdir=True,
+        )
+        return sorted(output_path.glob(f"year=*/{file_name}"))
 
     def create_member_year_metrics(self):
         """
@@ -86,14 +102,14 @@ class AnalyticsBuilder:
         logger.info("Creating member_year_metrics view")
 
         # Start with beneficiary data for demographics and total payments
-        beneficiary_df = self._read_complete_table("dim_beneficiary")
+        beneficiary_lf = self._scan_table("dim_beneficiary")
 
-        # Read claims data for utilization counts
-        claims_df = self._read_complete_table("fact_claims")
-        prescription_df = self._read_complete_table("fact_prescription")
+        # Scan claims data for utilization counts
+        claims_lf = self._scan_table("fact_claims")
+        prescription_lf = self._scan_table("fact_prescription")
 
         # Create base metrics from beneficiary data
-        metrics_df = beneficiary_df.select(
+        metrics_lf = beneficiary_lf.select(
             [
                 pl.col("bene_id"),
                 pl.col("year"),
@@ -105,103 +121,64 @@ class AnalyticsBuilder:
             ]
         )
 
-        # Count inpatient stays and outpatient visits
-        claim_counts = claims_df.group_by(["bene_id", "year", "claim_type"]).agg(
-            [pl.n_unique("claim_id").alias("claim_count")]
+        # One pass over claims: per-type stay/visit counts and the unique
+        # provider count come out of a single group_by instead of three
+        # separate scans of the claims table
+        has_provider = pl.col("provider_id").is_not_null() & (
+            pl.col("provider_id") != ""
         )
-
-        # Pivot the results to get one column per claim type
-        claim_counts_wide = claim_counts.pivot(
-            index=["bene_id", "year"], columns="claim_type", values="claim_count"
-        ).with_columns(
+        claims_agg = claims_lf.group_by(["bene_id", "year"]).agg(
             [
-                pl.col("inpatient").fill_null(0).alias("inpatient_stays"),
-                pl.col("outpatient").fill_null(0).alias("outpatient_visits"),
-                pl.col("carrier").fill_null(0).alias("carrier_claims"),
+                pl.col("claim_id")
+                .filter(pl.col("claim_type") == "inpatient")
+                .n_unique()
+                .alias("inpatient_stays"),
+                pl.col("claim_id")
+                .filter(pl.col("claim_type") == "outpatient")
+                .n_unique()
+                .alias("outpatient_visits"),
+                pl.col("claim_id")
+                .filter(pl.col("claim_type") == "carrier")
+                .n_unique()
+                .alias("carrier_claims"),
+                pl.col("provider_id")
+                .filter(has_provider)
+                .n_unique()
+                .alias("unique_providers"),
             ]
         )
 
-        # Count unique providers per member/year
-        provider_counts = (
-            claims_df.filter(
-                pl.col("provider_id").is_not_null() & (pl.col("provider_id") != "")
-            )
-            .group_by(["bene_id", "year"])
-            .agg([pl.n_unique("provider_id").alias("unique_providers")])
-        )
-
-        # Join claim counts to the metrics
-        metrics_df = metrics_df.join(
-            claim_counts_wide.select(
-                [
-                    "bene_id",
-                    "year",
-                    "inpatient_stays",
-                    "outpatient_visits",
-                    "carrier_claims",
-                ]
-            ),
-            on=["bene_id", "year"],
-            how="left",
-        )
-
-        # Fill missing values with zeros
-        metrics_df = metrics_df.with_columns(
+        # Join claim aggregates to the metrics and fill missing members with zeros
+        metrics_lf = metrics_lf.join(
+            claims_agg, on=["bene_id", "year"], how="left"
+        ).with_columns(
             [
                 pl.col("inpatient_stays").fill_null(0),
                 pl.col("outpatient_visits").fill_null(0),
                 pl.col("carrier_claims").fill_null(0),
+                pl.col("unique_providers").fill_null(0),
             ]
         )
 
-        # Join provider counts
-        metrics_df = metrics_df.join(
-            provider_counts, on=["bene_id", "year"], how="left"
-        ).with_columns([pl.col("unique_providers").fill_null(0)])
-
         # Count prescription fills
-        rx_counts = prescription_df.group_by(["bene_id", "year"]).agg(
+        rx_counts = prescription_lf.group_by(["bene_id", "year"]).agg(
             [pl.n_unique("prescription_id").alias("rx_fills")]
         )
 
         # Join rx counts
-        metrics_df = metrics_df.join(
+        metrics_lf = metrics_lf.join(
             rx_counts, on=["bene_id", "year"], how="left"
         ).with_columns([pl.col("rx_fills").fill_null(0)])
 
-        # Get claim providers
-        claim_providers = claims_df.filter(
-            pl.col("provider_id").is_not_null() & (pl.col("provider_id") != "")
-        ).select(["bene_id", "year", "provider_id"])
-
-        # Count unique providers from claims
-        provider_counts = claim_providers.group_by(["bene_id", "year"]).agg(
-            [pl.n_unique("provider_id").alias("unique_providers")]
-        )
-
-        # Update the metrics with provider counts
-        metrics_df = metrics_df.join(
-            provider_counts, on=["bene_id", "year"], how="left"
-        ).with_columns([pl.col("unique_providers").fill_null(0)])
-
-        # Write to parquet partitioned by year
+        # Sink to parquet partitioned by year
         output_path = self.gold_dir / "member_year_metrics"
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        # Partition and write by year
-        for year, year_df in metrics_df.partition_by("year", as_dict=True).items():
-            year_path = output_path / f"year={year}"
-            year_path.mkdir(parents=True, exist_ok=True)
-
-            year_df.write_parquet(
-                year_path / "member_year_metrics.parquet",
-                compression="zstd",
-                statistics=True,
-                use_pyarrow=True,
-            )
+        written = self._sink_partitioned_by_year(
+            metrics_lf, output_path, "member_year_metrics.parquet"
+        )
 
+        total_rows = sum(pq.read_metadata(f).num_rows for f in written)
         logger.info(
-            f"Successfully created member_year_metrics with {len(metrics_df)} rows"
+            f"Successfully created member_year_metrics with {total_rows} rows"
         )
 
     def create_top_diagnoses(self):
@@ -213,49 +190,74 @@ class AnalyticsBuilder:
         """
         logger.info("Creating top_diagnoses_by_member view")
 
-        diagnosis_df = self._read_complete_table("fact_claim_diagnoses")
+        diagnosis_lf = self._scan_table("fact_claim_diagnoses")
 
         # Aggregate diagnosis spend by member/year/diagnosis
-        diagnosis_spend = diagnosis_df.group_by(
+        diagnosis_spend = diagnosis_lf.group_by(
             ["bene_id", "year", "diagnosis_code", "diagnosis_description"]
         ).agg([pl.sum("payment").alias("diagnosis_payment")])
 
-        # Rank diagnoses by payment within each member/year
-        diagnosis_spend = diagnosis_spend.sort(
-            ["bene_id", "year", pl.col("diagnosis_payment").reverse()]
+        # Take the top 5 diagnoses per member/year directly: sort by payment
+        # within each group and keep the first five rows, instead of ranking
+        # every row with a window function and filtering afterwards
+        top_diagnoses = (
+            diagnosis_spend.sort(
+                ["bene_id", "year", "diagnosis_payment"],
+                descending=[False, False, True],
+            )
+            .group_by(["bene_id", "year"], maintain_order=True)
+            .head(5)
+            .with_columns(
+                (pl.int_range(pl.len()).over(["bene_id", "year"]) + 1).alias(
+                    "diagnosis_rank"
+                )
+            )
         )
 
-        # Add rank column using window function
-        diagnosis_spend = diagnosis_spend.with_columns(
-            [
-                pl.col("diagnosis_payment")
-                .rank(method="dense", descending=True)
-                .over(["bene_id", "year"])
-                .alias("diagnosis_rank")
-            ]
+        # Sink to parquet partitioned by year
+        output_path = self.gold_dir / "top_diagnoses_by_member"
+        written = self._sink_partitioned_by_year(
+            top_diagnoses, output_path, "top_diagnoses_by_member.parquet"
         )
 
-        # Filter to top 5 diagnoses per member/year
-        top_diagnoses = diagnosis_spend.filter(pl.col("diagnosis_rank") <= 5)
+        total_rows = sum(pq.read_metadata(f).num_rows for f in written)
+        logger.info(
+            f"Successfully created top_diagnoses_by_member with {total_rows} rows"
+        )
 
-        # Write to parquet partitioned by year
-        output_path = self.gold_dir / "top_diagnoses_by_member"
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        # Partition and write by year
-        for year, year_df in top_diagnoses.partition_by("year", as_dict=True).items():
-            year_path = output_path / f"year={year}"
-            year_path.mkdir(parents=True, exist_ok=True)
-
-            year_df.write_parquet(
-                year_path / "top_diagnoses_by_member.parquet",
-                compression="zstd",
-                statistics=True,
-                use_pyarrow=True,
-            )
+    def _write_bene_id_index(self, parquet_path: Path):
+        """
+        Write a sidecar index mapping bene_id ranges to row groups.
 
-        logger.info(
-            f"Successfully created top_diagnoses_by_member with {len(top_diagnoses)} rows"
+        Because the file is sorted by bene_id, each row group covers a
+        contiguous [min, max] ID range; the API can binary-search this index
+        and read a single row group instead of scanning the whole file.
+        """
+        parquet_file = pq.ParquetFile(parquet_path)
+        metadata = parquet_file.metadata
+
+        entries = []
+        for rg_idx in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg_idx)
+            for col_idx in range(row_group.num_columns):
+                column = row_group.column(col_idx)
+                if column.path_in_schema == "bene_id":
+                    stats = column.statistics
+                    entries.append(
+                        {
+                            "min_bene_id": stats.min,
+                            "max_bene_id": stats.max,
+                            "row_group": rg_idx,
+                        }
+                    )
+                    break
+
+        index_df = pl.DataFrame(entries)
+        index_df.write_parquet(
+            parquet_path.parent / "bene_id_index.parquet",
+            compression="zstd",
+            statistics=True,
+            use_pyarrow=True,
         )
 
     def create_patient_api_view(self):
@@ -263,17 +265,20 @@ class AnalyticsBuilder:
         Create a combined view optimized for the patient API endpoint.
 
         This view joins member metrics with top diagnoses for efficient API responses.
+
+        Rows are sorted by (year, bene_id) before writing so each Parquet row
+        group covers a narrow bene_id range — this sortedness is a contract of
+        the gold layer that makes the API's predicate pushdown on bene_id
+        actually skip row groups.
         """
         logger.info("Creating patient_api_view")
 
-        # Read metrics and diagnoses from the gold layer
-        metrics_df = self._read_complete_table("member_year_metrics", from_gold=True)
-        diagnoses_df = self._read_complete_table(
-            "top_diagnoses_by_member", from_gold=True
-        )
+        # Scan metrics and diagnoses from the gold layer
+        metrics_lf = self._scan_table("member_year_metrics", from_gold=True)
+        diagnoses_lf = self._scan_table("top_diagnoses_by_member", from_gold=True)
 
         # Select only needed columns from metrics
-        metrics_slim = metrics_df.select(
+        metrics_slim = metrics_lf.select(
             [
                 "bene_id",
                 "year",
@@ -286,33 +291,34 @@ class AnalyticsBuilder:
             ]
         )
 
-        # Write to parquet partitioned by year and bene_id (for faster lookups)
+        # Cluster rows by bene_id so row-group min/max statistics are narrow
+        # enough for readers to skip non-matching row groups
+        metrics_slim = metrics_slim.sort(["year", "bene_id"])
+
+        # Diagnoses additionally sort by rank within each member so readers
+        # can take the first rows per bene_id without re-sorting
+        diagnoses_lf = diagnoses_lf.sort(["year", "bene_id", "diagnosis_rank"])
+
+        # Sink to parquet partitioned by year (for faster lookups)
         output_path = self.gold_dir / "patient_api_view"
-        output_path.mkdir(parents=True, exist_ok=True)
 
         # Create patient metrics view
-        for year, year_df in metrics_slim.partition_by("year", as_dict=True).items():
-            year_path = output_path / f"year={year}"
-            year_path.mkdir(parents=True, exist_ok=True)
-
-            year_df.write_parquet(
-                year_path / "patient_metrics.parquet",
-                compression="zstd",
-                statistics=True,
-                use_pyarrow=True,
-            )
+        written = self._sink_partitioned_by_year(
+            metrics_slim,
+            output_path,
+            "patient_metrics.parquet",
+            row_group_size=64_000,
+        )
+        for metrics_file in written:
+            self._write_bene_id_index(metrics_file)
 
         # Create patient diagnoses view
-        for year, year_df in diagnoses_df.partition_by("year", as_dict=True).items():
-            year_path = output_path / f"year={year}"
-            year_path.mkdir(parents=True, exist_ok=True)
-
-            year_df.write_parquet(
-                year_path / "patient_diagnoses.parquet",
-                compression="zstd",
-                statistics=True,
-                use_pyarrow=True,
-            )
+        self._sink_partitioned_by_year(
+            diagnoses_lf,
+            output_path,
+            "patient_diagnoses.parquet",
+            row_group_size=64_000,
+        )
 
         logger.info("Successfully created patient_api_view")
 
@@ -330,6 +336,9 @@ class AnalyticsBuilder:
 
 
 def main():
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
     import argparse
 
     parser = argparse.ArgumentParser(
@@ -1,13 +1,507 @@
 import polars as pl
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 import logging
+from types import MappingProxyType
 
-# Enable string cache for categorical columns
-pl.enable_string_cache()
-
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# File-name tokens recognized by _get_file_type, matched in one C-level
+# regex scan and mapped to bronze table names
+_FILE_TYPE_RE = re.compile(
+    r"beneficiary|inpatient|outpatient|carrier|prescription_drug", re.IGNORECASE
+)
+
+# Standard DE-SynPUF file name: year (or year range) and sample in one scan
+_FILE_META_RE = re.compile(
+    r"DE1_0_(20\d{2})(?:_to_(20\d{2}))?_.+?(Sample_\d+)", re.IGNORECASE
+)
+_FILE_TYPE_MAP = {
+    "beneficiary": "beneficiary",
+    "inpatient": "inpatient",
+    "outpatient": "outpatient",
+    "carrier": "carrier",
+    "prescription_drug": "pde",
+}
+
+# Date columns arrive as YYYYMMDD — read as plain integers so the CSV
+# reader's fast integer path handles them, then split into date parts
+# with arithmetic (no string allocation or strptime per value)
+_DATE_COLUMNS = [
+    "CLM_FROM_DT",
+    "CLM_THRU_DT",
+    "CLM_ADMSN_DT",
+    "SRVC_DT",
+    "BENE_BIRTH_DT",
+    "BENE_DEATH_DT",
+]
+
+
+# Explicitly define column types for each file type (don't have to specify all
+# columns but its a nice reference). Declared once at module scope — the
+# literals run at import time instead of being rebuilt per converter instance
+_COLUMN_TYPES = MappingProxyType({
+    "beneficiary": {
+        "DESYNPUF_ID": pl.String,
+        "BENE_BIRTH_DT": pl.Date,
+        "BENE_DEATH_DT": pl.Date,
+        "BENE_SEX_IDENT_CD": pl.String,
+        "BENE_RACE_CD": pl.String,
+        "BENE_ESRD_IND": pl.String,
+        "SP_STATE_CODE": pl.String,
+        "BENE_COUNTY_CD": pl.String,
+        "BENE_HI_CVRAGE_TOT_MONS": pl.Int32,
+        "BENE_SMI_CVRAGE_TOT_MONS": pl.Int32,
+        "BENE_HMO_CVRAGE_TOT_MONS": pl.Int32,
+        "PLAN_CVRG_MOS_NUM": pl.Int32,
+        "SP_ALZHDMTA": pl.Int32,
+        "SP_CHF": pl.Int32,
+        "SP_CHRNKIDN": pl.Int32,
+        "SP_CNCR": pl.Int32,
+        "SP_COPD": pl.Int32,
+        "SP_DEPRESSN": pl.Int32,
+        "SP_DIABETES": pl.Int32,
+        "SP_ISCHMCHT": pl.Int32,
+        "SP_OSTEOPRS": pl.Int32,
+        "SP_RA_OA": pl.Int32,
+        "SP_STRKETIA": pl.Int32,
+        "MEDREIMB_IP": pl.Float64,
+        "BENRES_IP": pl.Float64,
+        "PPPYMT_IP": pl.Float64,
+        "MEDREIMB_OP": pl.Float64,
+        "BENRES_OP": pl.Float64,
+        "PPPYMT_OP": pl.Float64,
+        "MEDREIMB_CAR": pl.Float64,
+        "BENRES_CAR": pl.Float64,
+        "PPPYMT_CAR": pl.Float64,
+    },
+    "inpatient": {
+        "DESYNPUF_ID": pl.String,
+        "CLM_ID": pl.String,
+        "SEGMENT": pl.Int32,
+        "CLM_FROM_DT": pl.Date,
+        "CLM_THRU_DT": pl.Date,
+        "PRVDR_NUM": pl.String,
+        "CLM_PMT_AMT": pl.Float64,
+        "NCH_PRMRY_PYR_CLM_PD_AMT": pl.Float64,
+        "AT_PHYSN_NPI": pl.String,
+        "OP_PHYSN_NPI": pl.String,
+        "OT_PHYSN_NPI": pl.String,
+        "CLM_ADMSN_DT": pl.Date,
+        "ADMTNG_ICD9_DGNS_CD": pl.String,
+        "CLM_PASS_THRU_PER_DIEM_AMT": pl.Float64,
+        "NCH_BENE_IP_DDCTBL_AMT": pl.Float64,
+        "NCH_BENE_PTA_COINSRNC_LBLTY_AM": pl.Float64,
+        "NCH_BENE_BLOOD_DDCTBL_LBLTY_AM": pl.Float64,
+        "CLM_UTLZTN_DAY_CNT": pl.Int32,
+        "NCH_BENE_DSCHRG_DT": pl.Date,
+        "CLM_DRG_CD": pl.String,
+        "ICD9_DGNS_CD_1": pl.String,
+        "ICD9_DGNS_CD_2": pl.String,
+        "ICD9_DGNS_CD_3": pl.String,
+        "ICD9_DGNS_CD_4": pl.String,
+        "ICD9_DGNS_CD_5": pl.String,
+        "ICD9_DGNS_CD_6": pl.String,
+        "ICD9_DGNS_CD_7": pl.String,
+        "ICD9_DGNS_CD_8": pl.String,
+        "ICD9_DGNS_CD_9": pl.String,
+        "ICD9_DGNS_CD_10": pl.String,
+        "ICD9_PRCDR_CD_1": pl.String,
+        "ICD9_PRCDR_CD_2": pl.String,
+        "ICD9_PRCDR_CD_3": pl.String,
+        "ICD9_PRCDR_CD_4": pl.String,
+        "ICD9_PRCDR_CD_5": pl.String,
+        "ICD9_PRCDR_CD_6": pl.String,
+        "HCPCS_CD_1": pl.String,
+        "HCPCS_CD_2": pl.String,
+        "HCPCS_CD_3": pl.String,
+        "HCPCS_CD_4": pl.String,
+        "HCPCS_CD_5": pl.String,
+        "HCPCS_CD_6": pl.String,
+        "HCPCS_CD_7": pl.String,
+        "HCPCS_CD_8": pl.String,
+        "HCPCS_CD_9": pl.String,
+        "HCPCS_CD_10": pl.String,
+        "HCPCS_CD_11": pl.String,
+        "HCPCS_CD_12": pl.String,
+        "HCPCS_CD_13": pl.String,
+        "HCPCS_CD_14": pl.String,
+        "HCPCS_CD_15": pl.String,
+        "HCPCS_CD_16": pl.String,
+        "HCPCS_CD_17": pl.String,
+        "HCPCS_CD_18": pl.String,
+        "HCPCS_CD_19": pl.String,
+        "HCPCS_CD_20": pl.String,
+        "HCPCS_CD_21": pl.String,
+        "HCPCS_CD_22": pl.String,
+        "HCPCS_CD_23": pl.String,
+        "HCPCS_CD_24": pl.String,
+        "HCPCS_CD_25": pl.String,
+        "HCPCS_CD_26": pl.String,
+        "HCPCS_CD_27": pl.String,
+        "HCPCS_CD_28": pl.String,
+        "HCPCS_CD_29": pl.String,
+        "HCPCS_CD_30": pl.String,
+        "HCPCS_CD_31": pl.String,
+        "HCPCS_CD_32": pl.String,
+        "HCPCS_CD_33": pl.String,
+        "HCPCS_CD_34": pl.String,
+        "HCPCS_CD_35": pl.String,
+        "HCPCS_CD_36": pl.String,
+        "HCPCS_CD_37": pl.String,
+        "HCPCS_CD_38": pl.String,
+        "HCPCS_CD_39": pl.String,
+        "HCPCS_CD_40": pl.String,
+        "HCPCS_CD_41": pl.String,
+        "HCPCS_CD_42": pl.String,
+        "HCPCS_CD_43": pl.String,
+        "HCPCS_CD_44": pl.String,
+        "HCPCS_CD_45": pl.String,
+    },
+    "outpatient": {
+        "DESYNPUF_ID": pl.String,
+        "CLM_ID": pl.String,
+        "SEGMENT": pl.Int32,
+        "CLM_FROM_DT": pl.Date,
+        "CLM_THRU_DT": pl.Date,
+        "PRVDR_NUM": pl.String,
+        "CLM_PMT_AMT": pl.Float64,
+        "NCH_PRMRY_PYR_CLM_PD_AMT": pl.Float64,
+        "AT_PHYSN_NPI": pl.String,
+        "OP_PHYSN_NPI": pl.String,
+        "OT_PHYSN_NPI": pl.String,
+        "NCH_BENE_BLOOD_DDCTBL_LBLTY_AM": pl.Float64,
+        "ICD9_DGNS_CD_1": pl.String,
+        "ICD9_DGNS_CD_2": pl.String,
+        "ICD9_DGNS_CD_3": pl.String,
+        "ICD9_DGNS_CD_4": pl.String,
+        "ICD9_DGNS_CD_5": pl.String,
+        "ICD9_DGNS_CD_6": pl.String,
+        "ICD9_DGNS_CD_7": pl.String,
+        "ICD9_DGNS_CD_8": pl.String,
+        "ICD9_DGNS_CD_9": pl.String,
+        "ICD9_DGNS_CD_10": pl.String,
+        "ICD9_PRCDR_CD_1": pl.String,
+        "ICD9_PRCDR_CD_2": pl.String,
+        "ICD9_PRCDR_CD_3": pl.String,
+        "ICD9_PRCDR_CD_4": pl.String,
+        "ICD9_PRCDR_CD_5": pl.String,
+        "ICD9_PRCDR_CD_6": pl.String,
+        "NCH_BENE_PTB_DDCTBL_AMT": pl.Float64,
+        "NCH_BENE_PTB_COINSRNC_AMT": pl.Float64,
+        "ADMTNG_ICD9_DGNS_CD": pl.String,
+        "HCPCS_CD_1": pl.String,
+        "HCPCS_CD_2": pl.String,
+        "HCPCS_CD_3": pl.String,
+        "HCPCS_CD_4": pl.String,
+        "HCPCS_CD_5": pl.String,
+        "HCPCS_CD_6": pl.String,
+        "HCPCS_CD_7": pl.String,
+        "HCPCS_CD_8": pl.String,
+        "HCPCS_CD_9": pl.String,
+        "HCPCS_CD_10": pl.String,
+        "HCPCS_CD_11": pl.String,
+        "HCPCS_CD_12": pl.String,
+        "HCPCS_CD_13": pl.String,
+        "HCPCS_CD_14": pl.String,
+        "HCPCS_CD_15": pl.String,
+        "HCPCS_CD_16": pl.String,
+        "HCPCS_CD_17": pl.String,
+        "HCPCS_CD_18": pl.String,
+        "HCPCS_CD_19": pl.String,
+        "HCPCS_CD_20": pl.String,
+        "HCPCS_CD_21": pl.String,
+        "HCPCS_CD_22": pl.String,
+        "HCPCS_CD_23": pl.String,
+        "HCPCS_CD_24": pl.String,
+        "HCPCS_CD_25": pl.String,
+        "HCPCS_CD_26": pl.String,
+        "HCPCS_CD_27": pl.String,
+        "HCPCS_CD_28": pl.String,
+        "HCPCS_CD_29": pl.String,
+        "HCPCS_CD_30": pl.String,
+        "HCPCS_CD_31": pl.String,
+        "HCPCS_CD_32": pl.String,
+        "HCPCS_CD_33": pl.String,
+        "HCPCS_CD_34": pl.String,
+        "HCPCS_CD_35": pl.String,
+        "HCPCS_CD_36": pl.String,
+        "HCPCS_CD_37": pl.String,
+        "HCPCS_CD_38": pl.String,
+        "HCPCS_CD_39": pl.String,
+        "HCPCS_CD_40": pl.String,
+        "HCPCS_CD_41": pl.String,
+        "HCPCS_CD_42": pl.String,
+        "HCPCS_CD_43": pl.String,
+        "HCPCS_CD_44": pl.String,
+        "HCPCS_CD_45": pl.String,
+    },
+    "carrier": {
+        "DESYNPUF_ID": pl.String,
+        "CLM_ID": pl.String,
+        "CLM_FROM_DT": pl.Date,
+        "CLM_THRU_DT": pl.Date,
+        "ICD9_DGNS_CD_1": pl.String,
+        "ICD9_DGNS_CD_2": pl.String,
+        "ICD9_DGNS_CD_3": pl.String,
+        "ICD9_DGNS_CD_4": pl.String,
+        "ICD9_DGNS_CD_5": pl.String,
+        "ICD9_DGNS_CD_6": pl.String,
+        "ICD9_DGNS_CD_7": pl.String,
+        "ICD9_DGNS_CD_8": pl.String,
+        "PRF_PHYSN_NPI_1": pl.String,
+        "PRF_PHYSN_NPI_2": pl.String,
+        "PRF_PHYSN_NPI_3": pl.String,
+        "PRF_PHYSN_NPI_4": pl.String,
+        "PRF_PHYSN_NPI_5": pl.String,
+        "PRF_PHYSN_NPI_6": pl.String,
+        "PRF_PHYSN_NPI_7": pl.String,
+        "PRF_PHYSN_NPI_8": pl.String,
+        "PRF_PHYSN_NPI_9": pl.String,
+        "PRF_PHYSN_NPI_10": pl.String,
+        "PRF_PHYSN_NPI_11": pl.String,
+        "PRF_PHYSN_NPI_12": pl.String,
+        "PRF_PHYSN_NPI_13": pl.String,
+        "TAX_NUM_1": pl.String,
+        "TAX_NUM_2": pl.String,
+        "TAX_NUM_3": pl.String,
+        "TAX_NUM_4": pl.String,
+        "TAX_NUM_5": pl.String,
+        "TAX_NUM_6": pl.String,
+        "TAX_NUM_7": pl.String,
+        "TAX_NUM_8": pl.String,
+        "TAX_NUM_9": pl.String,
+        "TAX_NUM_10": pl.String,
+        "TAX_NUM_11": pl.String,
+        "TAX_NUM_12": pl.String,
+        "TAX_NUM_13": pl.String,
+        "HCPCS_CD_1": pl.String,
+        "HCPCS_CD_2": pl.String,
+        "HCPCS_CD_3": pl.String,
+        "HCPCS_CD_4": pl.String,
+        "HCPCS_CD_5": pl.String,
+        "HCPCS_CD_6": pl.String,
+        "HCPCS_CD_7": pl.String,
+        "HCPCS_CD_8": pl.String,
+        "HCPCS_CD_9": pl.String,
+        "HCPCS_CD_10": pl.String,
+        "HCPCS_CD_11": pl.String,
+        "HCPCS_CD_12": pl.String,
+        "HCPCS_CD_13": pl.String,
+        "LINE_NCH_PMT_AMT_1": pl.Float64,
+        "LINE_NCH_PMT_AMT_2": pl.Float64,
+        "LINE_NCH_PMT_AMT_3": pl.Float64,
+        "LINE_NCH_PMT_AMT_4": pl.Float64,
+        "LINE_NCH_PMT_AMT_5": pl.Float64,
+        "LINE_NCH_PMT_AMT_6": pl.Float64,
+        "LINE_NCH_PMT_AMT_7": pl.Float64,
+        "LINE_NCH_PMT_AMT_8": pl.Float64,
+        "LINE_NCH_PMT_AMT_9": pl.Float64,
+        "LINE_NCH_PMT_AMT_10": pl.Float64,
+        "LINE_NCH_PMT_AMT_11": pl.Float64,
+        "LINE_NCH_PMT_AMT_12": pl.Float64,
+        "LINE_NCH_PMT_AMT_13": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_1": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_2": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_3": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_4": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_5": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_6": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_7": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_8": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_9": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_10": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_11": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_12": pl.Float64,
+        "LINE_BENE_PTB_DDCTBL_AMT_13": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_1": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_2": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_3": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_4": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_5": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_6": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_7": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_8": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_9": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_10": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_11": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_12": pl.Float64,
+        "LINE_BENE_PRMRY_PYR_PD_AMT_13": pl.Float64,
+        "LINE_COINSRNC_AMT_1": pl.Float64,
+        "LINE_COINSRNC_AMT_2": pl.Float64,
+        "LINE_COINSRNC_AMT_3": pl.Float64,
+        "LINE_COINSRNC_AMT_4": pl.Float64,
+        "LINE_COINSRNC_AMT_5": pl.Float64,
+        "LINE_COINSRNC_AMT_6": pl.Float64,
+        "LINE_COINSRNC_AMT_7": pl.Float64,
+        "LINE_COINSRNC_AMT_8": pl.Float64,
+        "LINE_COINSRNC_AMT_9": pl.Float64,
+        "LINE_COINSRNC_AMT_10": pl.Float64,
+        "LINE_COINSRNC_AMT_11": pl.Float64,
+        "LINE_COINSRNC_AMT_12": pl.Float64,
+        "LINE_COINSRNC_AMT_13": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_1": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_2": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_3": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_4": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_5": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_6": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_7": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_8": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_9": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_10": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_11": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_12": pl.Float64,
+        "LINE_ALOWD_CHRG_AMT_13": pl.Float64,
+        "LINE_PRCSG_IND_CD_1": pl.String,
+        "LINE_PRCSG_IND_CD_2": pl.String,
+        "LINE_PRCSG_IND_CD_3": pl.String,
+        "LINE_PRCSG_IND_CD_4": pl.String,
+        "LINE_PRCSG_IND_CD_5": pl.String,
+        "LINE_PRCSG_IND_CD_6": pl.String,
+        "LINE_PRCSG_IND_CD_7": pl.String,
+        "LINE_PRCSG_IND_CD_8": pl.String,
+        "LINE_PRCSG_IND_CD_9": pl.String,
+        "LINE_PRCSG_IND_CD_10": pl.String,
+        "LINE_PRCSG_IND_CD_11": pl.String,
+        "LINE_PRCSG_IND_CD_12": pl.String,
+        "LINE_PRCSG_IND_CD_13": pl.String,
+        "LINE_ICD9_DGNS_CD_1": pl.String,
+        "LINE_ICD9_DGNS_CD_2": pl.String,
+        "LINE_ICD9_DGNS_CD_3": pl.String,
+        "LINE_ICD9_DGNS_CD_4": pl.String,
+        "LINE_ICD9_DGNS_CD_5": pl.String,
+        "LINE_ICD9_DGNS_CD_6": pl.String,
+        "LINE_ICD9_DGNS_CD_7": pl.String,
+        "LINE_ICD9_DGNS_CD_8": pl.String,
+        "LINE_ICD9_DGNS_CD_9": pl.String,
+        "LINE_ICD9_DGNS_CD_10": pl.String,
+        "LINE_ICD9_DGNS_CD_11": pl.String,
+        "LINE_ICD9_DGNS_CD_12": pl.String,
+        "LINE_ICD9_DGNS_CD_13": pl.String,
+    },
+    "pde": {
+        "DESYNPUF_ID": pl.String,
+        "PDE_ID": pl.String,
+        "SRVC_DT": pl.Date,
+        "PROD_SRVC_ID": pl.String,
+        "QTY_DSPNSD_NUM": pl.Float64,
+        "DAYS_SUPLY_NUM": pl.Int32,
+        "PTNT_PAY_AMT": pl.Float64,
+        "TOT_RX_CST_AMT": pl.Float64,
+    },
+})
+
+# Define mappings for categorical columns
+_SEX_MAPPING = MappingProxyType({"1": "Male", "2": "Female"})
+
+_RACE_MAPPING = MappingProxyType({
+    "1": "White",
+    "2": "Black",
+    "3": "Others",
+    "5": "Hispanic",
+})
+
+_STATE_MAPPING = MappingProxyType({
+    "01": "AL",  # Alabama
+    "02": "AK",  # Alaska
+    "03": "AZ",  # Arizona
+    "04": "AR",  # Arkansas
+    "05": "CA",  # California
+    "06": "CO",  # Colorado
+    "07": "CT",  # Connecticut
+    "08": "DE",  # Delaware
+    "09": "DC",  # District of Columbia
+    "10": "FL",  # Florida
+    "11": "GA",  # Georgia
+    "12": "HI",  # Hawaii
+    "13": "ID",  # Idaho
+    "14": "IL",  # Illinois
+    "15": "IN",  # Indiana
+    "16": "IA",  # Iowa
+    "17": "KS",  # Kansas
+    "18": "KY",  # Kentucky
+    "19": "LA",  # Louisiana
+    "20": "ME",  # Maine
+    "21": "MD",  # Maryland
+    "22": "MA",  # Massachusetts
+    "23": "MI",  # Michigan
+    "24": "MN",  # Minnesota
+    "25": "MS",  # Mississippi
+    "26": "MO",  # Missouri
+    "27": "MT",  # Montana
+    "28": "NE",  # Nebraska
+    "29": "NV",  # Nevada
+    "30": "NH",  # New Hampshire
+    "31": "NJ",  # New Jersey
+    "32": "NM",  # New Mexico
+    "33": "NY",  # New York
+    "34": "NC",  # North Carolina
+    "35": "ND",  # North Dakota
+    "36": "OH",  # Ohio
+    "37": "OK",  # Oklahoma
+    "38": "OR",  # Oregon
+    "39": "PA",  # Pennsylvania
+    "40": "RI",  # Rhode Island
+    "41": "SC",  # South Carolina
+    "42": "SD",  # South Dakota
+    "43": "TN",  # Tennessee
+    "44": "TX",  # Texas
+    "45": "UT",  # Utah
+    "46": "VT",  # Vermont
+    "47": "VA",  # Virginia
+    "48": "WA",  # Washington
+    "49": "WV",  # West Virginia
+    "50": "WI",  # Wisconsin
+    "51": "WY",  # Wyoming
+    "52": "PR",  # Puerto Rico
+    "53": "VI",  # Virgin Islands
+    "54": "GU",  # Guam
+    "55": "AS",  # American Samoa
+    "56": "MP",  # Northern Mariana Islands
+    "99": "Unknown",  # Unknown or missing
+})
+
+
+def _mapping_series(mapping: dict) -> tuple:
+    """Build (old, new) Series for a code mapping."""
+    return (
+        pl.Series(list(mapping.keys())),
+        pl.Series(list(mapping.values())),
+    )
+
+
+# Prebuilt replace_strict arguments for the code mappings: constructing the
+# Series once at import skips the per-converter dict-to-Arrow conversion
+_SEX_OLD, _SEX_NEW = _mapping_series(_SEX_MAPPING)
+_RACE_OLD, _RACE_NEW = _mapping_series(_RACE_MAPPING)
+_STATE_OLD, _STATE_NEW = _mapping_series(_STATE_MAPPING)
+
+# Arrow equivalents of the read-time Polars dtypes, for the compressed-input
+# path that parses through pyarrow.csv
+_ARROW_TYPES = {
+    pl.String: pa.string(),
+    pl.Int32: pa.int32(),
+    pl.Float64: pa.float64(),
+    pl.Date: pa.date32(),
+}
+
+# Read-time schema per file type: the date-column overrides are applied once
+# here instead of copying and patching the dict per file
+_READ_SCHEMA = {
+    file_type: {
+        col: (pl.Int32 if col in _DATE_COLUMNS else dtype)
+        for col, dtype in schema.items()
+    }
+    for file_type, schema in _COLUMN_TYPES.items()
+}
+
 
 class CSVToParquetConverter:
     """
@@ -21,494 +515,79 @@ class CSVToParquetConverter:
     - Data quality checks
     """
 
-    def __init__(self, input_dir: str, output_dir: str):
+    def __init__(
+        self,
+        input_dir: str,
+        output_dir: str,
+        keep_columns: dict[str, list[str]] | None = None,
+    ):
         self.input_dir = Path(input_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Explicitly define column types for each file type (don't have to specify all columns but its a nice reference)
-        self.column_types = {
-            "beneficiary": {
-                "DESYNPUF_ID": pl.String,
-                "BENE_BIRTH_DT": pl.Date,
-                "BENE_DEATH_DT": pl.Date,
-                "BENE_SEX_IDENT_CD": pl.Categorical,
-                "BENE_RACE_CD": pl.Categorical,
-                "BENE_ESRD_IND": pl.Categorical,
-                "SP_STATE_CODE": pl.Categorical,
-                "BENE_COUNTY_CD": pl.Categorical,
-                "BENE_HI_CVRAGE_TOT_MONS": pl.Int32,
-                "BENE_SMI_CVRAGE_TOT_MONS": pl.Int32,
-                "BENE_HMO_CVRAGE_TOT_MONS": pl.Int32,
-                "PLAN_CVRG_MOS_NUM": pl.Int32,
-                "SP_ALZHDMTA": pl.Int32,
-                "SP_CHF": pl.Int32,
-                "SP_CHRNKIDN": pl.Int32,
-                "SP_CNCR": pl.Int32,
-                "SP_COPD": pl.Int32,
-                "SP_DEPRESSN": pl.Int32,
-                "SP_DIABETES": pl.Int32,
-                "SP_ISCHMCHT": pl.Int32,
-                "SP_OSTEOPRS": pl.Int32,
-                "SP_RA_OA": pl.Int32,
-                "SP_STRKETIA": pl.Int32,
-                "MEDREIMB_IP": pl.Decimal(precision=10, scale=2),
-                "BENRES_IP": pl.Decimal(precision=10, scale=2),
-                "PPPYMT_IP": pl.Decimal(precision=10, scale=2),
-                "MEDREIMB_OP": pl.Decimal(precision=10, scale=2),
-                "BENRES_OP": pl.Decimal(precision=10, scale=2),
-                "PPPYMT_OP": pl.Decimal(precision=10, scale=2),
-                "MEDREIMB_CAR": pl.Decimal(precision=10, scale=2),
-                "BENRES_CAR": pl.Decimal(precision=10, scale=2),
-                "PPPYMT_CAR": pl.Decimal(precision=10, scale=2),
-            },
-            "inpatient": {
-                "DESYNPUF_ID": pl.String,
-                "CLM_ID": pl.String,
-                "SEGMENT": pl.Int32,
-                "CLM_FROM_DT": pl.Date,
-                "CLM_THRU_DT": pl.Date,
-                "PRVDR_NUM": pl.String,
-                "CLM_PMT_AMT": pl.Decimal(precision=10, scale=2),
-                "NCH_PRMRY_PYR_CLM_PD_AMT": pl.Decimal(precision=10, scale=2),
-                "AT_PHYSN_NPI": pl.String,
-                "OP_PHYSN_NPI": pl.String,
-                "OT_PHYSN_NPI": pl.String,
-                "CLM_ADMSN_DT": pl.Date,
-                "ADMTNG_ICD9_DGNS_CD": pl.String,
-                "CLM_PASS_THRU_PER_DIEM_AMT": pl.Decimal(precision=10, scale=2),
-                "NCH_BENE_IP_DDCTBL_AMT": pl.Decimal(precision=10, scale=2),
-                "NCH_BENE_PTA_COINSRNC_LBLTY_AM": pl.Decimal(precision=10, scale=2),
-                "NCH_BENE_BLOOD_DDCTBL_LBLTY_AM": pl.Decimal(precision=10, scale=2),
-                "CLM_UTLZTN_DAY_CNT": pl.Int32,
-                "NCH_BENE_DSCHRG_DT": pl.Date,
-                "CLM_DRG_CD": pl.String,
-                "ICD9_DGNS_CD_1": pl.String,
-                "ICD9_DGNS_CD_2": pl.String,
-                "ICD9_DGNS_CD_3": pl.String,
-                "ICD9_DGNS_CD_4": pl.String,
-                "ICD9_DGNS_CD_5": pl.String,
-                "ICD9_DGNS_CD_6": pl.String,
-                "ICD9_DGNS_CD_7": pl.String,
-                "ICD9_DGNS_CD_8": pl.String,
-                "ICD9_DGNS_CD_9": pl.String,
-                "ICD9_DGNS_CD_10": pl.String,
-                "ICD9_PRCDR_CD_1": pl.String,
-                "ICD9_PRCDR_CD_2": pl.String,
-                "ICD9_PRCDR_CD_3": pl.String,
-                "ICD9_PRCDR_CD_4": pl.String,
-                "ICD9_PRCDR_CD_5": pl.String,
-                "ICD9_PRCDR_CD_6": pl.String,
-                "HCPCS_CD_1": pl.String,
-                "HCPCS_CD_2": pl.String,
-                "HCPCS_CD_3": pl.String,
-                "HCPCS_CD_4": pl.String,
-                "HCPCS_CD_5": pl.String,
-                "HCPCS_CD_6": pl.String,
-                "HCPCS_CD_7": pl.String,
-                "HCPCS_CD_8": pl.String,
-                "HCPCS_CD_9": pl.String,
-                "HCPCS_CD_10": pl.String,
-                "HCPCS_CD_11": pl.String,
-                "HCPCS_CD_12": pl.String,
-                "HCPCS_CD_13": pl.String,
-                "HCPCS_CD_14": pl.String,
-                "HCPCS_CD_15": pl.String,
-                "HCPCS_CD_16": pl.String,
-                "HCPCS_CD_17": pl.String,
-                "HCPCS_CD_18": pl.String,
-                "HCPCS_CD_19": pl.String,
-                "HCPCS_CD_20": pl.String,
-                "HCPCS_CD_21": pl.String,
-                "HCPCS_CD_22": pl.String,
-                "HCPCS_CD_23": pl.String,
-                "HCPCS_CD_24": pl.String,
-                "HCPCS_CD_25": pl.String,
-                "HCPCS_CD_26": pl.String,
-                "HCPCS_CD_27": pl.String,
-                "HCPCS_CD_28": pl.String,
-                "HCPCS_CD_29": pl.String,
-                "HCPCS_CD_30": pl.String,
-                "HCPCS_CD_31": pl.String,
-                "HCPCS_CD_32": pl.String,
-                "HCPCS_CD_33": pl.String,
-                "HCPCS_CD_34": pl.String,
-                "HCPCS_CD_35": pl.String,
-                "HCPCS_CD_36": pl.String,
-                "HCPCS_CD_37": pl.String,
-                "HCPCS_CD_38": pl.String,
-                "HCPCS_CD_39": pl.String,
-                "HCPCS_CD_40": pl.String,
-                "HCPCS_CD_41": pl.String,
-                "HCPCS_CD_42": pl.String,
-                "HCPCS_CD_43": pl.String,
-                "HCPCS_CD_44": pl.String,
-                "HCPCS_CD_45": pl.String,
-            },
-            "outpatient": {
-                "DESYNPUF_ID": pl.String,
-                "CLM_ID": pl.String,
-                "SEGMENT": pl.Int32,
-                "CLM_FROM_DT": pl.Date,
-                "CLM_THRU_DT": pl.Date,
-                "PRVDR_NUM": pl.String,
-                "CLM_PMT_AMT": pl.Decimal(precision=10, scale=2),
-                "NCH_PRMRY_PYR_CLM_PD_AMT": pl.Decimal(precision=10, scale=2),
-                "AT_PHYSN_NPI": pl.String,
-                "OP_PHYSN_NPI": pl.String,
-                "OT_PHYSN_NPI": pl.String,
-                "NCH_BENE_BLOOD_DDCTBL_LBLTY_AM": pl.Decimal(precision=10, scale=2),
-                "ICD9_DGNS_CD_1": pl.String,
-                "ICD9_DGNS_CD_2": pl.String,
-                "ICD9_DGNS_CD_3": pl.String,
-                "ICD9_DGNS_CD_4": pl.String,
-                "ICD9_DGNS_CD_5": pl.String,
-                "ICD9_DGNS_CD_6": pl.String,
-                "ICD9_DGNS_CD_7": pl.String,
-                "ICD9_DGNS_CD_8": pl.String,
-                "ICD9_DGNS_CD_9": pl.String,
-                "ICD9_DGNS_CD_10": pl.String,
-                "ICD9_PRCDR_CD_1": pl.String,
-                "ICD9_PRCDR_CD_2": pl.String,
-                "ICD9_PRCDR_CD_3": pl.String,
-                "ICD9_PRCDR_CD_4": pl.String,
-                "ICD9_PRCDR_CD_5": pl.String,
-                "ICD9_PRCDR_CD_6": pl.String,
-                "NCH_BENE_PTB_DDCTBL_AMT": pl.Decimal(precision=10, scale=2),
-                "NCH_BENE_PTB_COINSRNC_AMT": pl.Decimal(precision=10, scale=2),
-                "ADMTNG_ICD9_DGNS_CD": pl.String,
-                "HCPCS_CD_1": pl.String,
-                "HCPCS_CD_2": pl.String,
-                "HCPCS_CD_3": pl.String,
-                "HCPCS_CD_4": pl.String,
-                "HCPCS_CD_5": pl.String,
-                "HCPCS_CD_6": pl.String,
-                "HCPCS_CD_7": pl.String,
-                "HCPCS_CD_8": pl.String,
-                "HCPCS_CD_9": pl.String,
-                "HCPCS_CD_10": pl.String,
-                "HCPCS_CD_11": pl.String,
-                "HCPCS_CD_12": pl.String,
-                "HCPCS_CD_13": pl.String,
-                "HCPCS_CD_14": pl.String,
-                "HCPCS_CD_15": pl.String,
-                "HCPCS_CD_16": pl.String,
-                "HCPCS_CD_17": pl.String,
-                "HCPCS_CD_18": pl.String,
-                "HCPCS_CD_19": pl.String,
-                "HCPCS_CD_20": pl.String,
-                "HCPCS_CD_21": pl.String,
-                "HCPCS_CD_22": pl.String,
-                "HCPCS_CD_23": pl.String,
-                "HCPCS_CD_24": pl.String,
-                "HCPCS_CD_25": pl.String,
-                "HCPCS_CD_26": pl.String,
-                "HCPCS_CD_27": pl.String,
-                "HCPCS_CD_28": pl.String,
-                "HCPCS_CD_29": pl.String,
-                "HCPCS_CD_30": pl.String,
-                "HCPCS_CD_31": pl.String,
-                "HCPCS_CD_32": pl.String,
-                "HCPCS_CD_33": pl.String,
-                "HCPCS_CD_34": pl.String,
-                "HCPCS_CD_35": pl.String,
-                "HCPCS_CD_36": pl.String,
-                "HCPCS_CD_37": pl.String,
-                "HCPCS_CD_38": pl.String,
-                "HCPCS_CD_39": pl.String,
-                "HCPCS_CD_40": pl.String,
-                "HCPCS_CD_41": pl.String,
-                "HCPCS_CD_42": pl.String,
-                "HCPCS_CD_43": pl.String,
-                "HCPCS_CD_44": pl.String,
-                "HCPCS_CD_45": pl.String,
-            },
-            "carrier": {
-                "DESYNPUF_ID": pl.String,
-                "CLM_ID": pl.String,
-                "CLM_FROM_DT": pl.Date,
-                "CLM_THRU_DT": pl.Date,
-                "ICD9_DGNS_CD_1": pl.String,
-                "ICD9_DGNS_CD_2": pl.String,
-                "ICD9_DGNS_CD_3": pl.String,
-                "ICD9_DGNS_CD_4": pl.String,
-                "ICD9_DGNS_CD_5": pl.String,
-                "ICD9_DGNS_CD_6": pl.String,
-                "ICD9_DGNS_CD_7": pl.String,
-                "ICD9_DGNS_CD_8": pl.String,
-                "PRF_PHYSN_NPI_1": pl.String,
-                "PRF_PHYSN_NPI_2": pl.String,
-                "PRF_PHYSN_NPI_3": pl.String,
-                "PRF_PHYSN_NPI_4": pl.String,
-                "PRF_PHYSN_NPI_5": pl.String,
-                "PRF_PHYSN_NPI_6": pl.String,
-                "PRF_PHYSN_NPI_7": pl.String,
-                "PRF_PHYSN_NPI_8": pl.String,
-                "PRF_PHYSN_NPI_9": pl.String,
-                "PRF_PHYSN_NPI_10": pl.String,
-                "PRF_PHYSN_NPI_11": pl.String,
-                "PRF_PHYSN_NPI_12": pl.String,
-                "PRF_PHYSN_NPI_13": pl.String,
-                "TAX_NUM_1": pl.String,
-                "TAX_NUM_2": pl.String,
-                "TAX_NUM_3": pl.String,
-                "TAX_NUM_4": pl.String,
-                "TAX_NUM_5": pl.String,
-                "TAX_NUM_6": pl.String,
-                "TAX_NUM_7": pl.String,
-                "TAX_NUM_8": pl.String,
-                "TAX_NUM_9": pl.String,
-                "TAX_NUM_10": pl.String,
-                "TAX_NUM_11": pl.String,
-                "TAX_NUM_12": pl.String,
-                "TAX_NUM_13": pl.String,
-                "HCPCS_CD_1": pl.String,
-                "HCPCS_CD_2": pl.String,
-                "HCPCS_CD_3": pl.String,
-                "HCPCS_CD_4": pl.String,
-                "HCPCS_CD_5": pl.String,
-                "HCPCS_CD_6": pl.String,
-                "HCPCS_CD_7": pl.String,
-                "HCPCS_CD_8": pl.String,
-                "HCPCS_CD_9": pl.String,
-                "HCPCS_CD_10": pl.String,
-                "HCPCS_CD_11": pl.String,
-                "HCPCS_CD_12": pl.String,
-                "HCPCS_CD_13": pl.String,
-                "LINE_NCH_PMT_AMT_1": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_2": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_3": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_4": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_5": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_6": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_7": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_8": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_9": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_10": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_11": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_12": pl.Decimal(precision=10, scale=2),
-                "LINE_NCH_PMT_AMT_13": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_1": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_2": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_3": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_4": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_5": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_6": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_7": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_8": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_9": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_10": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_11": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_12": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PTB_DDCTBL_AMT_13": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_1": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_2": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_3": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_4": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_5": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_6": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_7": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_8": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_9": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_10": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_11": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_12": pl.Decimal(precision=10, scale=2),
-                "LINE_BENE_PRMRY_PYR_PD_AMT_13": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_1": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_2": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_3": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_4": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_5": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_6": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_7": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_8": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_9": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_10": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_11": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_12": pl.Decimal(precision=10, scale=2),
-                "LINE_COINSRNC_AMT_13": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_1": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_2": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_3": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_4": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_5": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_6": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_7": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_8": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_9": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_10": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_11": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_12": pl.Decimal(precision=10, scale=2),
-                "LINE_ALOWD_CHRG_AMT_13": pl.Decimal(precision=10, scale=2),
-                "LINE_PRCSG_IND_CD_1": pl.String,
-                "LINE_PRCSG_IND_CD_2": pl.String,
-                "LINE_PRCSG_IND_CD_3": pl.String,
-                "LINE_PRCSG_IND_CD_4": pl.String,
-                "LINE_PRCSG_IND_CD_5": pl.String,
-                "LINE_PRCSG_IND_CD_6": pl.String,
-                "LINE_PRCSG_IND_CD_7": pl.String,
-                "LINE_PRCSG_IND_CD_8": pl.String,
-                "LINE_PRCSG_IND_CD_9": pl.String,
-                "LINE_PRCSG_IND_CD_10": pl.String,
-                "LINE_PRCSG_IND_CD_11": pl.String,
-                "LINE_PRCSG_IND_CD_12": pl.String,
-                "LINE_PRCSG_IND_CD_13": pl.String,
-                "LINE_ICD9_DGNS_CD_1": pl.String,
-                "LINE_ICD9_DGNS_CD_2": pl.String,
-                "LINE_ICD9_DGNS_CD_3": pl.String,
-                "LINE_ICD9_DGNS_CD_4": pl.String,
-                "LINE_ICD9_DGNS_CD_5": pl.String,
-                "LINE_ICD9_DGNS_CD_6": pl.String,
-                "LINE_ICD9_DGNS_CD_7": pl.String,
-                "LINE_ICD9_DGNS_CD_8": pl.String,
-                "LINE_ICD9_DGNS_CD_9": pl.String,
-                "LINE_ICD9_DGNS_CD_10": pl.String,
-                "LINE_ICD9_DGNS_CD_11": pl.String,
-                "LINE_ICD9_DGNS_CD_12": pl.String,
-                "LINE_ICD9_DGNS_CD_13": pl.String,
-            },
-            "pde": {
-                "DESYNPUF_ID": pl.String,
-                "PDE_ID": pl.String,
-                "SRVC_DT": pl.Date,
-                "PROD_SRVC_ID": pl.String,
-                "QTY_DSPNSD_NUM": pl.Decimal(precision=10, scale=2),
-                "DAYS_SUPLY_NUM": pl.Int32,
-                "PTNT_PAY_AMT": pl.Decimal(precision=10, scale=2),
-                "TOT_RX_CST_AMT": pl.Decimal(precision=10, scale=2),
-            },
-        }
-
-        # Define mappings for categorical columns
-        self.sex_mapping = {"1": "Male", "2": "Female"}
-
-        self.race_mapping = {
-            "1": "White",
-            "2": "Black",
-            "3": "Others",
-            "5": "Hispanic",
-        }
+        # Optional per-file-type column projection. When set, the selection
+        # pushes down into the CSV scan so unselected fields are skipped by
+        # the parser instead of decoded and dropped later.
+        self.keep_columns = keep_columns
 
-        self.state_mapping = {
-            "01": "AL",  # Alabama
-            "02": "AK",  # Alaska
-            "03": "AZ",  # Arizona
-            "04": "AR",  # Arkansas
-            "05": "CA",  # California
-            "06": "CO",  # Colorado
-            "07": "CT",  # Connecticut
-            "08": "DE",  # Delaware
-            "09": "DC",  # District of Columbia
-            "10": "FL",  # Florida
-            "11": "GA",  # Georgia
-            "12": "HI",  # Hawaii
-            "13": "ID",  # Idaho
-            "14": "IL",  # Illinois
-            "15": "IN",  # Indiana
-            "16": "IA",  # Iowa
-            "17": "KS",  # Kansas
-            "18": "KY",  # Kentucky
-            "19": "LA",  # Louisiana
-            "20": "ME",  # Maine
-            "21": "MD",  # Maryland
-            "22": "MA",  # Massachusetts
-            "23": "MI",  # Michigan
-            "24": "MN",  # Minnesota
-            "25": "MS",  # Mississippi
-            "26": "MO",  # Missouri
-            "27": "MT",  # Montana
-            "28": "NE",  # Nebraska
-            "29": "NV",  # Nevada
-            "30": "NH",  # New Hampshire
-            "31": "NJ",  # New Jersey
-            "32": "NM",  # New Mexico
-            "33": "NY",  # New York
-            "34": "NC",  # North Carolina
-            "35": "ND",  # North Dakota
-            "36": "OH",  # Ohio
-            "37": "OK",  # Oklahoma
-            "38": "OR",  # Oregon
-            "39": "PA",  # Pennsylvania
-            "40": "RI",  # Rhode Island
-            "41": "SC",  # South Carolina
-            "42": "SD",  # South Dakota
-            "43": "TN",  # Tennessee
-            "44": "TX",  # Texas
-            "45": "UT",  # Utah
-            "46": "VT",  # Vermont
-            "47": "VA",  # Virginia
-            "48": "WA",  # Washington
-            "49": "WV",  # West Virginia
-            "50": "WI",  # Wisconsin
-            "51": "WY",  # Wyoming
-            "52": "PR",  # Puerto Rico
-            "53": "VI",  # Virgin Islands
-            "54": "GU",  # Guam
-            "55": "AS",  # American Samoa
-            "56": "MP",  # Northern Mariana Islands
-            "99": "Unknown",  # Unknown or missing
-        }
+        # Per-file (file_type, year, sample_id) cache — _extract_year scans
+        # the CSV, so resolve each file's metadata exactly once
+        self._file_meta_cache: dict = {}
 
-    def normalize_data(self, df: pl.DataFrame, file_type: str) -> pl.DataFrame:
+    def normalize_data(self, lf: pl.LazyFrame, file_type: str) -> pl.LazyFrame:
         """
         Normalize data based on file type.
 
+        The transformations are expressed against a LazyFrame so they fuse
+        into the streaming scan instead of re-materializing the table.
+
         Args:
-            df: Input DataFrame to normalize
+            lf: Input LazyFrame to normalize
             file_type: Type of file (beneficiary, inpatient, outpatient, carrier, pde)
 
         Returns:
-            Normalized DataFrame
+            Normalized LazyFrame
         """
-        logger.info(
-            f"Starting normalization for {file_type} data with {df.height} rows and {df.width} columns."
-        )
-
-        # Filter out rows where all values are null
-        original_row_count = df.height
-        df = df.filter(~pl.all_horizontal(pl.all().is_null()))
-        removed_rows = original_row_count - df.height
-        if removed_rows > 0:
-            logger.info(f"Removed {removed_rows} completely empty rows.")
+        logger.info(f"Applying normalization for {file_type} data.")
 
         if file_type == "beneficiary":
-            df = self._normalize_beneficiary_data(df)
+            # Drop rows where every value is null. Claim files skip this:
+            # they carry required keys, and on ~180-column carrier data the
+            # full-width scan is a whole extra pass. any_horizontal
+            # short-circuits per row on the first populated cell.
+            lf = lf.filter(pl.any_horizontal(pl.all().is_not_null()))
+            lf = self._normalize_beneficiary_data(lf)
 
-        logger.info(
-            f"Finished normalization for {file_type} data. Resulting table has {df.height} rows and {df.width} columns."
-        )
+        return lf
 
-        return df
-
-    def _normalize_beneficiary_data(self, df: pl.DataFrame) -> pl.DataFrame:
+    def _normalize_beneficiary_data(self, lf: pl.LazyFrame) -> pl.LazyFrame:
         logger.info("Normalizing beneficiary data...")
+        # Hashed membership for the dozen-plus per-column presence checks
+        columns = frozenset(lf.collect_schema().names())
         expressions = []
         new_column_expressions = []
         columns_to_drop_after_new_added = []
 
-        if "BENE_SEX_IDENT_CD" in df.columns:
+        if "BENE_SEX_IDENT_CD" in columns:
             new_column_expressions.append(
                 pl.col("BENE_SEX_IDENT_CD")
-                .replace(self.sex_mapping, default=None)
-                .cast(pl.Categorical)
+                .replace_strict(_SEX_OLD, _SEX_NEW, default=None)
                 .alias("SEX")
             )
             columns_to_drop_after_new_added.append("BENE_SEX_IDENT_CD")
 
-        if "BENE_RACE_CD" in df.columns:
+        if "BENE_RACE_CD" in columns:
             new_column_expressions.append(
                 pl.col("BENE_RACE_CD")
-                .replace(self.race_mapping, default=None)
-                .cast(pl.Categorical)
+                .replace_strict(_RACE_OLD, _RACE_NEW, default=None)
                 .alias("RACE")
             )
             columns_to_drop_after_new_added.append("BENE_RACE_CD")
 
-        if "SP_STATE_CODE" in df.columns:
+        if "SP_STATE_CODE" in columns:
             new_column_expressions.append(
                 pl.col("SP_STATE_CODE")
-                .replace(self.state_mapping, default=None)
-                .cast(pl.Categorical)
+                .replace_strict(_STATE_OLD, _STATE_NEW, default=None)
                 .alias("STATE_CODE")
             )
             columns_to_drop_after_new_added.append("SP_STATE_CODE")
@@ -526,80 +605,75 @@ class CSVToParquetConverter:
             "SP_RA_OA",
             "SP_STRKETIA",
         ]
+        # The schema declares these Int32, so compare against integer
+        # literals directly instead of round-tripping every cell through Utf8
         for col_name in chronic_condition_cols:
-            if col_name in df.columns:
+            if col_name in columns:
                 expressions.append(
-                    pl.when(pl.col(col_name).cast(pl.Utf8) == "2")
+                    pl.when(pl.col(col_name) == 2)
                     .then(True)
-                    .when(pl.col(col_name).cast(pl.Utf8) == "1")
+                    .when(pl.col(col_name) == 1)
                     .then(False)
                     .otherwise(pl.lit(None, dtype=pl.Boolean))
                     .alias(col_name)
                 )
 
-        if "BENE_ESRD_IND" in df.columns:
+        if "BENE_ESRD_IND" in columns:
+            # Hashed-set membership check on the one-character flag — no
+            # uppercased copy of the whole column
             expressions.append(
-                pl.when(pl.col("BENE_ESRD_IND").cast(pl.Utf8).str.to_uppercase() == "Y")
-                .then(True)
-                .otherwise(False)
+                pl.col("BENE_ESRD_IND")
+                .is_in(["Y", "y"])
+                .fill_null(False)
                 .alias("BENE_ESRD_IND")
             )
 
-        if expressions:
-            df = df.with_columns(expressions)
-
-        if new_column_expressions:
-            df = df.with_columns(new_column_expressions)
-            actual_columns_to_drop = [
-                col for col in columns_to_drop_after_new_added if col in df.columns
-            ]
-            if actual_columns_to_drop:
-                df = df.drop(actual_columns_to_drop)
+        # Apply in-place and renamed columns in one projection: the renamed
+        # columns read from the originals, so adding them and dropping the
+        # sources in a single with_columns + drop keeps one pass in the plan
+        all_expressions = expressions + new_column_expressions
+        if all_expressions:
+            lf = lf.with_columns(all_expressions)
+        if columns_to_drop_after_new_added:
+            lf = lf.drop(columns_to_drop_after_new_added)
 
         logger.info("Finished normalizing beneficiary data.")
-        return df
+        return lf
 
     def _get_file_type(self, file_path: Path) -> str:
         """Determine the type of file based on its name."""
-        file_name = file_path.name.lower()
-
-        file_types = {
-            "beneficiary": "beneficiary",
-            "inpatient": "inpatient",
-            "outpatient": "outpatient",
-            "carrier": "carrier",
-            "prescription_drug": "pde",
-        }
-
-        for key, value in file_types.items():
-            if key in file_name:
-                return value
-
-        raise ValueError(f"Unknown file type for {file_path}")
+        match = _FILE_TYPE_RE.search(file_path.name)
+        if match is None:
+            raise ValueError(f"Unknown file type for {file_path}")
+        return _FILE_TYPE_MAP[match.group(0).lower()]
 
     def _extract_year(self, file_path: Path) -> int:
-        """Extract year from file name."""
-        # For beneficiary files, extract from filename
-        if "beneficiary" in file_path.name.lower():
-            for part in file_path.stem.split("_"):
-                if part.isdigit() and len(part) == 4:
-                    return int(part)
-
-        # For other files, extract from the data
-        df = pl.read_csv(
+        """Extract year from file name, falling back to the data."""
+        # Files carrying a single year encode it in the name (e.g. the
+        # beneficiary summaries); a range like 2008_to_2010 is ambiguous, so
+        # those fall through to reading the data
+        years_in_name = set(re.findall(r"20\d{2}", file_path.stem))
+        if len(years_in_name) == 1:
+            return int(years_in_name.pop())
+
+        # Project just the date column from the first rows — projection
+        # pushdown means the CSV reader only parses that one field per row
+        lf = pl.scan_csv(
             file_path,
-            n_rows=1000,
             infer_schema_length=10000,
             ignore_errors=True,
-            schema_overrides={"CLM_FROM_DT": pl.String, "SRVC_DT": pl.String},
+            schema_overrides={"CLM_FROM_DT": pl.Int32, "SRVC_DT": pl.Int32},
         )
-        if "CLM_FROM_DT" in df.columns:
-            year = int(df["CLM_FROM_DT"].str.slice(0, 4).mode()[0])
-            return year
-
-        elif "SRVC_DT" in df.columns:
-            year = int(df["SRVC_DT"].str.slice(0, 4).mode()[0])
-            return year
+        columns = lf.collect_schema().names()
+        for date_col in ("CLM_FROM_DT", "SRVC_DT"):
+            if date_col in columns:
+                years = (
+                    lf.select(pl.col(date_col) // 10000)
+                    .head(1000)
+                    .collect()
+                    .to_series()
+                )
+                return int(years.mode()[0])
 
     def _extract_sample_id(self, file_path: Path) -> str:
         """Extract sample ID from file name."""
@@ -609,11 +683,53 @@ class CSVToParquetConverter:
                 return part
         raise ValueError(f"Could not extract sample ID from {file_path}")
 
-    def _get_bene_id_prefix(self, bene_id: str) -> str:
-        """Extract the first 2 characters of the beneficiary ID as prefix for partitioning."""
-        if bene_id and len(bene_id) >= 2:
-            return bene_id[:2]
-        return "00"  # Default prefix for empty or short IDs
+    def _file_metadata(self, file_path: Path) -> tuple:
+        """Resolve (file_type, year, sample_id) for a file, cached per path."""
+        meta = self._file_meta_cache.get(file_path)
+        if meta is not None:
+            return meta
+
+        # One match over the standard DE-SynPUF name yields year and sample
+        # together; nonstandard names fall back to the piecewise extractors,
+        # and a year range still defers to the data scan
+        match = _FILE_META_RE.search(file_path.stem)
+        if match is not None and match.group(2) is None:
+            year = int(match.group(1))
+        else:
+            year = self._extract_year(file_path)
+        if match is not None:
+            sample_id = match.group(3)
+        else:
+            sample_id = self._extract_sample_id(file_path)
+
+        meta = (self._get_file_type(file_path), year, sample_id)
+        self._file_meta_cache[file_path] = meta
+        return meta
+
+    def _scan_compressed_csv(self, file_path: Path, file_type: str) -> pl.LazyFrame:
+        """
+        Read a compressed CSV through Arrow's block-based streaming reader.
+
+        Polars decompresses a gzipped file wholesale before parsing it, which
+        doubles peak memory. Arrow's open_csv pipes ~8 MiB blocks through the
+        decompressor and type-converts batch by batch, so peak memory is the
+        decoded table rather than raw text plus table.
+        """
+        convert_options = pa_csv.ConvertOptions(
+            column_types={
+                col: _ARROW_TYPES[dtype]
+                for col, dtype in _READ_SCHEMA[file_type].items()
+            },
+            null_values=["", "NA", "NULL", "null", "NaN", "nan"],
+            strings_can_be_null=True,
+        )
+        with pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(block_size=8 << 20),
+            convert_options=convert_options,
+        ) as reader:
+            table = reader.read_all()
+        return pl.from_arrow(table).lazy()
 
     def _validate_data(self, df: pl.DataFrame, file_type: str) -> pl.DataFrame:
         """
@@ -626,82 +742,83 @@ class CSVToParquetConverter:
         if file_type != "beneficiary":
             key_columns.append("CLM_ID")
 
-        missing_stats = {}
-        for col in key_columns:
-            if col in df.columns:
-                missing_count = df.filter(pl.col(col).is_null()).height
-                missing_stats[col] = (
-                    f"{missing_count} ({(missing_count / total_rows) * 100:.2f}%)"
-                )
+        # One kernel call counts nulls for just the key columns — the
+        # remaining ~180 columns of a claims table never get touched
+        present_keys = [col for col in key_columns if col in df.columns]
+        null_counts = (
+            df.select(pl.col(col).null_count() for col in present_keys).row(
+                0, named=True
+            )
+            if present_keys
+            else {}
+        )
+        missing_stats = {
+            col: f"{count} ({(count / total_rows) * 100:.2f}%)"
+            for col, count in null_counts.items()
+        }
 
         # Log validation results
         logger.info(f"Data validation for {file_type}: Total rows: {total_rows}")
         for col, stat in missing_stats.items():
             logger.info(f"  Missing {col}: {stat}")
 
-        # Filter out rows with missing beneficiary IDs
-        if "DESYNPUF_ID" in df.columns:
-            invalid_rows = df.filter(pl.col("DESYNPUF_ID").is_null()).height
+        # Drop rows with missing beneficiary IDs
+        if "DESYNPUF_ID" in null_counts:
+            invalid_rows = null_counts["DESYNPUF_ID"]
             if invalid_rows > 0:
                 logger.warning(f"Removing {invalid_rows} rows with missing DESYNPUF_ID")
-                df = df.filter(~pl.col("DESYNPUF_ID").is_null())
+                df = df.drop_nulls(subset=["DESYNPUF_ID"])
 
         return df
 
     def convert_file(self, file_path: Path) -> None:
         """Convert a single CSV file to Parquet format with proper partitioning."""
-        file_type = self._get_file_type(file_path)
-        year = self._extract_year(file_path)
-        sample_id = self._extract_sample_id(file_path)
+        file_type, year, sample_id = self._file_metadata(file_path)
 
         logger.info(f"Processing {file_path}")
 
-        date_format = "%Y%m%d"  # Format: YYYYMMDD
-        date_columns = [
-            "CLM_FROM_DT",
-            "CLM_THRU_DT",
-            "CLM_ADMSN_DT",
-            "SRVC_DT",
-            "BENE_BIRTH_DT",
-            "BENE_DEATH_DT",
+        # Scan the CSV lazily with proper column types so parsing, date
+        # conversion and Parquet encoding stream through in chunks instead of
+        # materializing the whole file. Compressed inputs go through Arrow's
+        # streaming reader, which decompresses block by block.
+        if file_path.suffix in {".gz", ".zst"}:
+            lf = self._scan_compressed_csv(file_path, file_type)
+        else:
+            lf = pl.scan_csv(
+                file_path,
+                schema_overrides=_READ_SCHEMA[file_type],
+                infer_schema_length=10000,
+                ignore_errors=True,
+                null_values=["", "NA", "NULL", "null", "NaN", "nan"],
+                low_memory=True,
+            )
+        if self.keep_columns and file_type in self.keep_columns:
+            lf = lf.select(self.keep_columns[file_type])
+        csv_columns = frozenset(lf.collect_schema().names())
+
+        # Convert date columns in a single projection so the conversions run
+        # in one pass instead of one pipeline stage per column
+        date_exprs = [
+            pl.date(
+                pl.col(col) // 10000,
+                (pl.col(col) // 100) % 100,
+                pl.col(col) % 100,
+            ).alias(col)
+            for col in _DATE_COLUMNS
+            if col in csv_columns
         ]
+        if date_exprs:
+            lf = lf.with_columns(date_exprs)
 
-        # Update column types to read date columns as strings first
-        schema_overrides = self.column_types[file_type].copy()
-        for col in date_columns:
-            if col in schema_overrides:
-                schema_overrides[col] = pl.String
-
-        # Read CSV with proper column types
-        df = pl.read_csv(
-            file_path,
-            schema_overrides=schema_overrides,
-            infer_schema_length=10000,
-            ignore_errors=True,
-            null_values=["", "NA", "NULL", "null", "NaN", "nan"],
-        )
-
-        # Convert date columns
-        for col in date_columns:
-            if col in df.columns:
-                df = df.with_columns(
-                    [
-                        pl.col(col)
-                        .str.strptime(pl.Date, format=date_format, strict=False)
-                        .alias(col)
-                    ]
-                )
+        lf = self.normalize_data(lf, file_type)
 
-        df = self.normalize_data(df, file_type)
-
-        # Create year column
-        df = df.with_columns(
-            [pl.lit(year).alias("year"), pl.lit(sample_id).alias("sample_id")]
-        )
+        # year and sample_id are not materialized as columns: they are
+        # constant per file and live in the hive path instead, where
+        # hive-aware readers reconstruct them for free
 
         # Create partition columns for beneficiary data
-        if "DESYNPUF_ID" in df.columns:
-            df = df.with_columns(
+        if "DESYNPUF_ID" in csv_columns:
+            lf = lf.with_columns(
                 [
                     pl.col("DESYNPUF_ID")
                     .str.slice(0, 2)
@@ -711,47 +828,120 @@ class CSVToParquetConverter:
             )
 
         # Create output path with partitioning
-        # Structure: {file_type}/year={year}/bene_id_prefix={prefix}/file.parquet
-        if "bene_id_prefix" in df.columns:
-            for prefix, group_df in df.partition_by(
-                "bene_id_prefix", as_dict=True
-            ).items():
-                output_path = (
-                    self.output_dir
-                    / file_type
-                    / f"year={year}"
-                    / f"bene_id_prefix={prefix}"
-                    / f"{file_path.stem}.parquet"
-                )
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-
-                group_df.write_parquet(output_path, compression="zstd", statistics=True)
+        # Structure: {file_type}/year={year}/sample_id={sample_id}/
+        #     bene_id_prefix={prefix}/file.parquet
+        if "DESYNPUF_ID" in csv_columns:
+            # Native partitioned sink: the writer splits on the prefix column
+            # itself, streaming every partition in one pass with no
+            # per-partition DataFrame materialization. The key stays out of
+            # the files too — it is redundant with the directory name.
+            year_dir = (
+                self.output_dir / file_type / f"year={year}" / f"sample_id={sample_id}"
+            )
+            lf.sink_parquet(
+                pl.PartitionBy(
+                    year_dir,
+                    key="bene_id_prefix",
+                    include_key=False,
+                    file_path_provider=lambda args: (
+                        f"bene_id_prefix={args.partition_keys.item()}"
+                        f"/{file_path.stem}.parquet"
+                    ),
+                    approximate_bytes_per_file=None,
+                ),
+                compression="zstd",
+                # Level 1 writes ~3x faster than the zstd default for ~10%
+                # larger files — the right trade for a bronze layer that is
+                # written once and re-read once by the silver build
+                compression_level=1,
+                statistics=True,
+                row_group_size=512_000,
+                data_page_size=1 << 20,
+                mkdir=True,
+            )
 
             logger.info(
-                f"Successfully partitioned and converted {file_path} to {self.output_dir}/{file_type}/year={year}/..."
+                f"Successfully partitioned and converted {file_path} to {year_dir}/..."
             )
         else:
-            # For files without beneficiary ID, use only year partitioning
+            # For files without beneficiary ID, use only year partitioning and
+            # stream straight to a single Parquet file
             output_path = (
                 self.output_dir
                 / file_type
                 / f"year={year}"
+                / f"sample_id={sample_id}"
                 / f"{file_path.stem}.parquet"
             )
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
-            df.write_parquet(output_path, compression="zstd", statistics=True)
+            lf.sink_parquet(
+                output_path,
+                compression="zstd",
+                compression_level=1,
+                statistics=True,
+                row_group_size=512_000,
+                data_page_size=1 << 20,
+            )
             logger.info(f"Successfully converted {file_path} to {output_path}")
 
+    @contextmanager
+    def conversion_pool(self, max_workers: int | None = None):
+        """
+        Yield a submit(file_path) callable backed by a worker process pool.
+
+        Callers can hand files over one at a time as they become available —
+        the downloader submits each CSV the moment its archive is extracted —
+        instead of waiting for the full list. On exit the pool drains and any
+        worker error propagates. Workers are spawned (not forked) so each one
+        initializes its own Polars thread pool from POLARS_MAX_THREADS,
+        capped to avoid oversubscribing the machine when several files
+        convert at once.
+        """
+        cpus = os.cpu_count() or 2
+        workers = max(1, cpus // 2)
+        if max_workers is not None:
+            workers = min(workers, max_workers)
+        os.environ["POLARS_MAX_THREADS"] = str(max(1, cpus // workers))
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = []
+
+                def submit(file_path) -> None:
+                    futures.append(pool.submit(self.convert_file, Path(file_path)))
+
+                yield submit
+                for future in as_completed(futures):
+                    future.result()
+        finally:
+            os.environ.pop("POLARS_MAX_THREADS", None)
+
+    def convert_all(self, file_paths: list) -> None:
+        """
+        Convert many CSV files concurrently, one worker process per file.
+
+        Polars parallelizes within a file, but the driver loop is serial;
+        with many sample files a process pool keeps every core busy.
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return
+
+        with self.conversion_pool(max_workers=len(file_paths)) as submit:
+            for path in file_paths:
+                submit(path)
+
     def process_directory(self) -> None:
-        """Process all CSV files in the input directory."""
-        for file_path in self.input_dir.glob("**/*.csv"):
-            self.convert_file(file_path)
+        """Process all CSV files in the input directory concurrently."""
+        self.convert_all(sorted(self.input_dir.glob("**/*.csv")))
 
 
 def main():
     import argparse
 
+    logging.basicConfig(level=logging.INFO)
+
     parser = argparse.ArgumentParser(
         description="Convert Medicare CSV files to Parquet format"
     )
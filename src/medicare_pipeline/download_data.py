@@ -1,20 +1,133 @@
 #!/usr/bin/env python3
 
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+from urllib3.util.retry import Retry
+import shutil
+import tempfile
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import BinaryIO, Callable
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 
+class PartialDownloadError(IOError):
+    """A transfer ended short of the advertised size or failed its checksum."""
+
+
+# Optional fast path: extract members while bytes are still arriving, so the
+# zip itself never exists in full anywhere
+try:
+    from stream_unzip import stream_unzip, UnzipError
+except ImportError:
+    stream_unzip = None
+    UnzipError = None
+
+# Optional fast path: ISA-L's SIMD DEFLATE decompressor is ~2-3x faster than
+# zlib; zipfile resolves its zlib module attribute at call time, so swapping
+# it in covers every extraction below
+try:
+    from isal import isal_zlib
+
+    zipfile.zlib = isal_zlib
+except ImportError:
+    pass
+
+
+def _mirror_candidates(filename: str, url: str) -> list[str]:
+    """
+    URLs that may host an identical copy of an archive.
+
+    CMS serves the SynPUF archives from both www.cms.gov and
+    downloads.cms.gov; which one is faster varies by runner and by how
+    degraded each CDN is on a given day. The configured URL always comes
+    first so it wins ties and remains the fallback when no probe succeeds.
+    """
+    candidates = [url]
+    for alternate in (
+        f"http://downloads.cms.gov/files/{filename}",
+        "https://www.cms.gov/research-statistics-data-and-systems/"
+        f"downloadable-public-use-files/synpufs/downloads/{filename.lower()}",
+    ):
+        if alternate not in candidates:
+            candidates.append(alternate)
+    return candidates
+
+
+# DE-SynPUF Sample 1 archives as (filename, url) pairs — a frozen
+# module-level table rather than a per-instance dict, so every
+# DataDownloader shares one copy and tests can parametrize against it
+FILE_URLS: tuple[tuple[str, str], ...] = (
+    # Beneficiary Summary Files
+    (
+        "DE1_0_2008_Beneficiary_Summary_File_Sample_1.zip",
+        "https://www.cms.gov/research-statistics-data-and-systems/downloadable-public-use-files/synpufs/downloads/de1_0_2008_beneficiary_summary_file_sample_1.zip",
+    ),
+    (
+        "DE1_0_2009_Beneficiary_Summary_File_Sample_1.zip",
+        "https://www.cms.gov/research-statistics-data-and-systems/downloadable-public-use-files/synpufs/downloads/de1_0_2009_beneficiary_summary_file_sample_1.zip",
+    ),
+    (
+        "DE1_0_2010_Beneficiary_Summary_File_Sample_1.zip",
+        "https://www.cms.gov/sites/default/files/2020-09/DE1_0_2010_Beneficiary_Summary_File_Sample_1.zip",
+    ),
+    # Carrier Claims
+    (
+        "DE1_0_2008_to_2010_Carrier_Claims_Sample_1A.zip",
+        "http://downloads.cms.gov/files/DE1_0_2008_to_2010_Carrier_Claims_Sample_1A.zip",
+    ),
+    (
+        "DE1_0_2008_to_2010_Carrier_Claims_Sample_1B.zip",
+        "http://downloads.cms.gov/files/DE1_0_2008_to_2010_Carrier_Claims_Sample_1B.zip",
+    ),
+    # Inpatient and Outpatient Claims
+    (
+        "DE1_0_2008_to_2010_Inpatient_Claims_Sample_1.zip",
+        "https://www.cms.gov/research-statistics-data-and-systems/downloadable-public-use-files/synpufs/downloads/de1_0_2008_to_2010_inpatient_claims_sample_1.zip",
+    ),
+    (
+        "DE1_0_2008_to_2010_Outpatient_Claims_Sample_1.zip",
+        "https://www.cms.gov/research-statistics-data-and-systems/downloadable-public-use-files/synpufs/downloads/de1_0_2008_to_2010_outpatient_claims_sample_1.zip",
+    ),
+    # Prescription Drug Events
+    (
+        "DE1_0_2008_to_2010_Prescription_Drug_Events_Sample_1.zip",
+        "http://downloads.cms.gov/files/DE1_0_2008_to_2010_Prescription_Drug_Events_Sample_1.zip",
+    ),
+)
+
+
 class DataDownloader:
     """Handles downloading and extracting CMS DE-SynPUF data files."""
 
+    # Class-level alias so an instance (or a test) can override the table
+    # without touching the module constant
+    file_urls = FILE_URLS
+
+    # Files at least this large are fetched over several parallel HTTP range
+    # requests — per-connection throttling at the CDN, not our bandwidth, is
+    # what limits a single stream on the big claims archives. The same
+    # threshold decides when a single-stream download is staged in a
+    # resumable on-disk .part file rather than a spooled buffer.
+    _LARGE_FILE_THRESHOLD = 64 << 20
+    _RANGE_CONNECTIONS = 4
+
+    # Mirror probe results are kept on disk for a day so the HEAD probes
+    # aren't re-paid on every run
+    _MIRROR_CACHE_PATH = Path.home() / ".cache" / "medicare_pipeline" / "mirrors.json"
+    _MIRROR_CACHE_TTL = 24 * 60 * 60
+
     def __init__(self, output_dir: str = "data/raw"):
         """
         Initialize the downloader.
@@ -25,77 +138,378 @@ class DataDownloader:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Define file URLs for Sample 1
-        self.file_urls = {
-            # Beneficiary Summary Files
-            "DE1_0_2008_Beneficiary_Summary_File_Sample_1.zip": "https://www.cms.gov/research-statistics-data-and-systems/downloadable-public-use-files/synpufs/downloads/de1_0_2008_beneficiary_summary_file_sample_1.zip",
-            "DE1_0_2009_Beneficiary_Summary_File_Sample_1.zip": "https://www.cms.gov/research-statistics-data-and-systems/downloadable-public-use-files/synpufs/downloads/de1_0_2009_beneficiary_summary_file_sample_1.zip",
-            "DE1_0_2010_Beneficiary_Summary_File_Sample_1.zip": "https://www.cms.gov/sites/default/files/2020-09/DE1_0_2010_Beneficiary_Summary_File_Sample_1.zip",
-            # Carrier Claims
-            "DE1_0_2008_to_2010_Carrier_Claims_Sample_1A.zip": "http://downloads.cms.gov/files/DE1_0_2008_to_2010_Carrier_Claims_Sample_1A.zip",
-            "DE1_0_2008_to_2010_Carrier_Claims_Sample_1B.zip": "http://downloads.cms.gov/files/DE1_0_2008_to_2010_Carrier_Claims_Sample_1B.zip",
-            # Inpatient and Outpatient Claims
-            "DE1_0_2008_to_2010_Inpatient_Claims_Sample_1.zip": "https://www.cms.gov/research-statistics-data-and-systems/downloadable-public-use-files/synpufs/downloads/de1_0_2008_to_2010_inpatient_claims_sample_1.zip",
-            "DE1_0_2008_to_2010_Outpatient_Claims_Sample_1.zip": "https://www.cms.gov/research-statistics-data-and-systems/downloadable-public-use-files/synpufs/downloads/de1_0_2008_to_2010_outpatient_claims_sample_1.zip",
-            # Prescription Drug Events
-            "DE1_0_2008_to_2010_Prescription_Drug_Events_Sample_1.zip": "http://downloads.cms.gov/files/DE1_0_2008_to_2010_Prescription_Drug_Events_Sample_1.zip",
-        }
-
-    def download_file(self, url: str, filename: str) -> bool:
+        # One session shared by every download so the TCP/TLS handshake is
+        # paid once per host, not once per file; transient server errors and
+        # rate limits retry with backoff instead of failing the archive
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            max_retries=Retry(
+                total=5,
+                backoff_factor=1,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+            pool_connections=8,
+            pool_maxsize=8,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._mirror_lock = threading.Lock()
+        try:
+            self._mirror_cache = json.loads(self._MIRROR_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            self._mirror_cache = {}
+
+    def _fastest_mirror(self, filename: str, url: str) -> str:
+        """
+        Pick the quickest-responding mirror for an archive.
+
+        Fires a HEAD request at every known mirror concurrently and takes
+        the fastest one that answers 200; the winner is cached on disk with
+        a 24h TTL. Falls back to the configured URL when no probe succeeds.
+        """
+        entry = self._mirror_cache.get(filename)
+        if entry and time.time() - entry["timestamp"] < self._MIRROR_CACHE_TTL:
+            return entry["url"]
+
+        candidates = _mirror_candidates(filename, url)
+        if len(candidates) == 1:
+            return url
+
+        def probe(candidate: str) -> tuple[float, str] | None:
+            start = time.monotonic()
+            try:
+                response = self.session.head(
+                    candidate, allow_redirects=True, timeout=5
+                )
+                response.raise_for_status()
+            except requests.RequestException:
+                return None
+            return (time.monotonic() - start, candidate)
+
+        with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+            results = [result for result in pool.map(probe, candidates) if result]
+        if not results:
+            return url
+
+        best = min(results)[1]
+        if best != url:
+            logger.info(f"Using mirror {best} for {filename}")
+        with self._mirror_lock:
+            self._mirror_cache[filename] = {"url": best, "timestamp": time.time()}
+            try:
+                self._MIRROR_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                self._MIRROR_CACHE_PATH.write_text(json.dumps(self._mirror_cache))
+            except OSError:
+                pass
+        return best
+
+    def download_file(self, url: str, filename: str) -> BinaryIO:
         """
-        Download a single file.
+        Download a single file and return an open buffer on its contents.
+
+        Small files stream into a spooled in-memory buffer. Large files are
+        staged in an on-disk {filename}.part instead, so an interrupted run
+        resumes with a Range request from where it stopped rather than
+        refetching; the staging file is unlinked as soon as the open buffer
+        is handed back, so nothing lingers in the output directory.
 
         Args:
             url: URL to download from
-            filename: Name to save the file as
-        """
-        output_path = self.output_dir / filename
+            filename: Name used for progress logging and the .part file
 
+        Returns:
+            The open buffer, rewound to the start.
+        """
         logger.info(f"Downloading {filename}...")
-        response = requests.get(url, stream=True)
+
+        part_path = self.output_dir / f"{filename}.part"
+        existing = part_path.stat().st_size if part_path.exists() else 0
+
+        # Probe for range support first; large files that allow it (and have
+        # no partial download to resume) go over several connections
+        try:
+            head = self.session.head(url, allow_redirects=True, timeout=(10, 60))
+            head.raise_for_status()
+            head_size = int(head.headers.get("content-length", 0))
+            accepts_ranges = head.headers.get("accept-ranges", "").lower() == "bytes"
+        except requests.RequestException:
+            head_size = 0
+            accepts_ranges = False
+        if accepts_ranges and head_size >= self._LARGE_FILE_THRESHOLD and not existing:
+            return self._download_ranges(url, filename, head_size)
+
+        headers = {"Range": f"bytes={existing}-"} if existing else {}
+        response = self.session.get(url, stream=True, timeout=(10, 60), headers=headers)
         response.raise_for_status()
+        if existing and response.status_code == 206:
+            logger.info(f"Resuming {filename} from byte {existing:,}")
+        else:
+            # Either a fresh download or the server ignored the range
+            # request and restarted from the top
+            existing = 0
 
-        total_size = int(response.headers.get("content-length", 0))
-        block_size = 8192
-        downloaded = 0
+        total_size = existing + int(response.headers.get("content-length", 0))
 
-        with open(output_path, "wb") as f:
-            for data in response.iter_content(block_size):
-                downloaded += len(data)
-                f.write(data)
+        if existing or total_size >= self._LARGE_FILE_THRESHOLD:
+            buffer = open(part_path, "r+b" if existing else "w+b")
+            buffer.seek(existing)
+            is_part_file = True
+        else:
+            buffer = tempfile.SpooledTemporaryFile(max_size=256 << 20)
+            is_part_file = False
 
-                # Log progress
-                if total_size > 0:
+        # Hash as the bytes pass through when the server advertises a
+        # checksum — no second read of the file. A resumed transfer skips
+        # this since the earlier bytes were never hashed.
+        expected_md5 = response.headers.get("Content-MD5")
+        md5 = hashlib.md5() if expected_md5 and not existing else None
+
+        # Read straight off the urllib3 response in 1 MiB blocks, skipping
+        # iter_content's per-chunk generator machinery; decode_content keeps
+        # transparent gzip/deflate transfer encoding working
+        reader = response.raw
+        reader.decode_content = True
+        downloaded = existing
+        last_bucket = -1
+        while True:
+            # Reading the raw stream bypasses requests' exception wrapping,
+            # so translate a severed connection ourselves; the .part survives
+            # for the next run to resume
+            try:
+                data = reader.read(1 << 20)
+            except ProtocolError as e:
+                buffer.close()
+                raise PartialDownloadError(f"{filename}: {e}") from e
+            if not data:
+                break
+            downloaded += len(data)
+            buffer.write(data)
+            if md5 is not None:
+                md5.update(data)
+
+            # Log progress in 5% steps — per-chunk logging dominates wall
+            # time on multi-GB files
+            if total_size > 0:
+                bucket = int((downloaded / total_size) * 100) // 5
+                if bucket != last_bucket:
                     percent = (downloaded / total_size) * 100
                     logger.info(f"Downloaded {percent:.1f}% of {filename}")
+                    last_bucket = bucket
+
+        # Verify before handing off: a short transfer keeps its .part so the
+        # next run resumes it instead of refetching from scratch
+        if total_size > 0 and downloaded != total_size:
+            buffer.close()
+            raise PartialDownloadError(
+                f"{filename}: received {downloaded} of {total_size} bytes"
+            )
+        if md5 is not None and base64.b64encode(md5.digest()).decode() != expected_md5:
+            buffer.close()
+            if is_part_file:
+                part_path.unlink()
+            raise PartialDownloadError(f"{filename}: Content-MD5 mismatch")
+
+        buffer.seek(0)
+        if is_part_file:
+            part_path.unlink()
+        return buffer
+
+    def _download_ranges(self, url: str, filename: str, total_size: int) -> BinaryIO:
+        """
+        Fetch one file over several parallel HTTP range requests.
+
+        Each worker streams its byte range straight into the shared temp
+        file with positional writes, so no reassembly pass is needed. Uses a
+        real temp file (not a spooled one) because pwrite needs a file
+        descriptor; anything past the range threshold would spill anyway.
+        """
+        buffer = tempfile.TemporaryFile()
+        buffer.truncate(total_size)
+        fd = buffer.fileno()
+        span = -(-total_size // self._RANGE_CONNECTIONS)
+
+        def fetch(start: int) -> None:
+            end = min(start + span, total_size) - 1
+            response = self.session.get(
+                url,
+                stream=True,
+                timeout=(10, 60),
+                headers={"Range": f"bytes={start}-{end}"},
+            )
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise requests.HTTPError(
+                    f"Server ignored range request for {url}", response=response
+                )
+            reader = response.raw
+            reader.decode_content = True
+            offset = start
+            while True:
+                data = reader.read(1 << 20)
+                if not data:
+                    break
+                os.pwrite(fd, data, offset)
+                offset += len(data)
+            if offset != end + 1:
+                raise PartialDownloadError(
+                    f"{filename}: range {start}-{end} ended at byte {offset}"
+                )
+
+        starts = range(0, total_size, span)
+        with ThreadPoolExecutor(max_workers=self._RANGE_CONNECTIONS) as pool:
+            for future in [pool.submit(fetch, start) for start in starts]:
+                future.result()
 
-    def extract_zip(self, zip_path: Path) -> bool:
+        logger.info(f"Downloaded {filename} over {len(starts)} connections")
+        buffer.seek(0)
+        return buffer
+
+    def extract_zip(self, zip_source, name: str = "") -> bool:
         """
-        Extract a ZIP file.
+        Extract a ZIP file or file-like object.
 
         Args:
-            zip_path: Path to the ZIP file
+            zip_source: Path to a ZIP file, or a seekable binary file object
+            name: Display name for logging when zip_source is a buffer
+        """
+        logger.info(f"Extracting {name or zip_source}...")
+
+        # Member-wise extraction with a 4 MiB copy buffer: extractall reads
+        # in 16 KiB pieces, which on a multi-GB CSV means hundreds of
+        # thousands of extra read calls through the DEFLATE stream
+        with zipfile.ZipFile(zip_source, "r") as zip_ref:
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    (self.output_dir / info.filename).mkdir(
+                        parents=True, exist_ok=True
+                    )
+                    continue
+                target = self.output_dir / info.filename
+                target.parent.mkdir(parents=True, exist_ok=True)
+                # Extract to a temporary name and rename on completion, so
+                # a crash mid-member never leaves a truncated file at the
+                # final path for the skip check to mistake for a finished
+                # extraction
+                tmp_path = target.with_name(target.name + ".extracting")
+                try:
+                    with zip_ref.open(info) as src, open(tmp_path, "wb") as dst:
+                        shutil.copyfileobj(src, dst, length=4 * 1024 * 1024)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+                tmp_path.replace(target)
+
+    def _download_and_extract(self, filename: str, url: str, force: bool = False) -> bool:
+        """Download one archive and extract it. Returns True on success."""
+        # Skip archives whose extracted CSV is already in place, so a
+        # partial re-run only fetches what is actually missing
+        expected_csv = self.output_dir / f"{Path(filename).stem}.csv"
+        if not force and expected_csv.exists():
+            logger.info(f"Skipping {filename} — {expected_csv.name} already extracted")
+            return True
+
+        url = self._fastest_mirror(filename, url)
+
+        # Fresh transfers stream straight into the extractor when
+        # stream-unzip is installed; resuming a .part needs the buffered path
+        part_path = self.output_dir / f"{filename}.part"
+        if stream_unzip is not None and not part_path.exists():
+            try:
+                return self._stream_and_extract(filename, url)
+            except (requests.RequestException, UnzipError, zlib.error) as e:
+                # UnzipError/zlib.error cover the stream ending mid-member
+                # (truncated DEFLATE data, unfinished iteration), which
+                # surface from the extractor rather than requests
+                logger.error(f"Failed to stream {filename}: {e}")
+                return False
+
+        try:
+            buffer = self.download_file(url, filename)
+        except (requests.RequestException, PartialDownloadError) as e:
+            logger.error(f"Failed to download {filename}: {e}")
+            return False
+
+        try:
+            self.extract_zip(buffer, name=filename)
+        except zipfile.BadZipFile as e:
+            logger.error(f"Failed to extract {filename}: {e}")
+            return False
+        finally:
+            buffer.close()
+
+        return True
+
+    def _stream_and_extract(self, filename: str, url: str) -> bool:
         """
-        logger.info(f"Extracting {zip_path.name}...")
+        Extract an archive straight off the network stream.
 
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(self.output_dir)
+        stream-unzip parses the local file headers rather than the central
+        directory, so each member is written out as its bytes arrive — no
+        buffered copy of the zip in memory or on disk at all.
+        """
+        logger.info(f"Downloading and extracting {filename} (streamed)...")
+        with self.session.get(url, stream=True, timeout=(10, 60)) as response:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=1 << 20)
+            for member_name, _size, member_chunks in stream_unzip(chunks):
+                target = self.output_dir / member_name.decode()
+                target.parent.mkdir(parents=True, exist_ok=True)
+                # Stream into a temporary name and rename once the member
+                # is complete: a dropped connection otherwise strands a
+                # truncated CSV at the final path, which the already-
+                # extracted skip check would then trust on every re-run
+                tmp_path = target.with_name(target.name + ".extracting")
+                try:
+                    with open(tmp_path, "wb") as dst:
+                        for chunk in member_chunks:
+                            dst.write(chunk)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+                tmp_path.replace(target)
+        return True
 
-    def download_and_extract_all(self) -> bool:
+    def download_and_extract_all(
+        self,
+        force: bool = False,
+        on_extracted: Callable[[Path], None] | None = None,
+    ) -> bool:
         """
-        Download and extract all files.
+        Download and extract all files concurrently.
+
+        Downloads are network-bound with the CPU idle, so a small thread
+        pool overlaps the transfers; each archive is extracted by the worker
+        that fetched it as soon as it lands.
+
+        Args:
+            force: Re-download archives even when their CSV already exists
+            on_extracted: Called with each CSV path as soon as it is on disk
+                (including archives skipped because they were already
+                extracted), letting the next pipeline stage start on that
+                file while the remaining downloads are still in flight
         """
-        for filename, url in self.file_urls.items():
-            self.download_file(url, filename)
 
-            zip_path = self.output_dir / filename
-            self.extract_zip(zip_path)
+        def worker(filename: str, url: str) -> bool:
+            ok = self._download_and_extract(filename, url, force)
+            csv_path = self.output_dir / f"{Path(filename).stem}.csv"
+            if ok and on_extracted is not None and csv_path.exists():
+                on_extracted(csv_path)
+            return ok
 
-            zip_path.unlink()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = {
+                pool.submit(worker, filename, url): filename
+                for filename, url in self.file_urls
+            }
+            return all(future.result() for future in as_completed(futures))
 
 
 def main():
     """Main entry point for the script."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
     downloader = DataDownloader()
     downloader.download_and_extract_all()
 
@@ -1,5 +1,6 @@
 import argparse
 import logging
+import logging.handlers
 from pathlib import Path
 import sys
 import time
@@ -10,14 +11,29 @@ from medicare_pipeline.transform_data import DataTransformer
 from medicare_pipeline.create_analytics import AnalyticsBuilder
 from medicare_pipeline.validate_data import DataValidator
 
-# Configure logging
+# Configure logging. force=True replaces whatever handlers are already on
+# the root logger — icd9cms configures it as an import side effect — so this
+# config actually wins, and a re-import replaces rather than stacks handlers
+# (stacked handlers double every log write).
+#
+# The log file sits behind a MemoryHandler so the per-chunk progress
+# messages from the hot loops batch in memory and hit the disk 1024
+# records at a time instead of one write per line; anything WARNING or
+# above flushes the buffer immediately. delay=True keeps the file
+# unopened (and uncreated) until there is something to write.
+_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_file_handler = logging.FileHandler("medicare_pipeline.log", delay=True)
+_file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    format=_LOG_FORMAT,
     handlers=[
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler("medicare_pipeline.log"),  # TODO: make this work
+        logging.handlers.MemoryHandler(
+            capacity=1024, flushLevel=logging.WARNING, target=_file_handler
+        ),
     ],
+    force=True,
 )
 logger = logging.getLogger(__name__)
 
@@ -49,12 +65,13 @@ def setup_directories(base_dir: str = ".") -> dict:
     return dirs
 
 
-def run_download(raw_dir: Path) -> bool:
+def run_download(raw_dir: Path, force: bool = False) -> bool:
     """
     Download raw data files.
 
     Args:
         raw_dir: Directory to store raw files
+        force: Re-download files that are already present
 
     Returns:
         True if successful
@@ -63,12 +80,44 @@ def run_download(raw_dir: Path) -> bool:
 
     start_time = time.time()
     downloader = DataDownloader(str(raw_dir))
-    downloader.download_and_extract_all()
+    downloader.download_and_extract_all(force=force)
     end_time = time.time()
 
     logger.info(f"Data download completed in {end_time - start_time:.2f} seconds")
 
 
+def run_download_and_conversion(
+    raw_dir: Path, bronze_dir: Path, force: bool = False
+) -> bool:
+    """
+    Download raw data files and convert them as they arrive.
+
+    Each CSV is handed to the converter's process pool the moment its
+    archive is extracted, so network transfers and CPU-bound conversion
+    overlap instead of running as back-to-back phases.
+
+    Args:
+        raw_dir: Directory to store raw files
+        bronze_dir: Directory to store bronze layer files
+        force: Re-download files that are already present
+
+    Returns:
+        True if successful
+    """
+    logger.info("=== Starting overlapped download + conversion phase ===")
+
+    start_time = time.time()
+    downloader = DataDownloader(str(raw_dir))
+    converter = CSVToParquetConverter(str(raw_dir), str(bronze_dir))
+    with converter.conversion_pool() as submit:
+        downloader.download_and_extract_all(force=force, on_extracted=submit)
+    end_time = time.time()
+
+    logger.info(
+        f"Download + conversion completed in {end_time - start_time:.2f} seconds"
+    )
+
+
 def run_conversion(raw_dir: Path, bronze_dir: Path) -> bool:
     """
     Convert raw CSV files to Parquet format (bronze layer).
@@ -148,28 +197,35 @@ def run_validation(base_dir: Path) -> bool:
     start_time = time.time()
     validator = DataValidator(str(base_dir))
     validator.validate_all()
-    validator.print_summary()
-    validator.save_results()
     all_valid = all(info["status"] == "valid" for info in validator.summary.values())
     end_time = time.time()
 
     logger.info(f"Data validation completed in {end_time - start_time:.2f} seconds")
 
+    # Fail fast: surface the failing layers in the log and raise before
+    # spending time serializing the full results JSON
     if not all_valid:
-        logger.warning("Validation FAILED - see validation_results.json for details")
+        for layer, info in validator.summary.items():
+            if info["status"] != "valid":
+                logger.warning(
+                    f"Validation failed for {layer} layer: "
+                    f"status={info['status']}, issues={info['issues']}"
+                )
         raise ValueError("Validation FAILED")
 
+    validator.print_summary()
+    validator.save_results()
     logger.info("Validation PASSED")
 
 
-def run_pipeline(base_dir: str, steps: list) -> bool:
+def run_pipeline(base_dir: str, steps: list, force_download: bool = False) -> bool:
     """
     Run the complete data pipeline or specific steps.
 
     Args:
         base_dir: Base directory for all data
         steps: List of steps to run ["download", "convert", "transform", "analytics", "validate"]
-        skip_download_if_exists: Skip download if files already exist
+        force_download: Re-download raw files even when already present
         validation_output: Path to save validation results
 
     Returns:
@@ -180,10 +236,15 @@ def run_pipeline(base_dir: str, steps: list) -> bool:
     # Set up directories
     dirs = setup_directories(base_dir)
 
-    # Run selected steps
-    if "download" in steps:
-        run_download(dirs["raw"])
-    if "convert" in steps:
+    # Run selected steps; when both download and convert are requested,
+    # fuse them so conversion starts as soon as each file is extracted
+    if "download" in steps and "convert" in steps:
+        run_download_and_conversion(
+            dirs["raw"], dirs["bronze"], force=force_download
+        )
+    elif "download" in steps:
+        run_download(dirs["raw"], force=force_download)
+    elif "convert" in steps:
         run_conversion(dirs["raw"], dirs["bronze"])
     if "transform" in steps:
         run_transformation(dirs["bronze"], dirs["silver"])
@@ -204,6 +265,11 @@ def main():
         default="all",
         help="Comma-separated list of steps to run: download,convert,transform,analytics,validate",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-download raw files even if they already exist",
+    )
 
     args = parser.parse_args()
 
@@ -213,8 +279,11 @@ def main():
     else:
         steps = args.steps.split(",")
 
-    # Run pipeline
-    success = run_pipeline(args.base_dir, steps)
+    # Run pipeline; drain the buffered log handlers whichever way it ends
+    try:
+        success = run_pipeline(args.base_dir, steps, force_download=args.force)
+    finally:
+        logging.shutdown()
 
     # Exit with appropriate code
     sys.exit(0 if success else 1)